@@ -1,109 +1,140 @@
-from typing import List
+from typing import Optional, Sequence, Union
 from Data import Data
-from Node import Node
+from Heuristic import Heuristic, make_heuristic
+from Memo import Memo
 from PriorityQueue import PriorityQueue
 from Solver import Solver, Solution
+from State import State
 
 class AStar(Solver):
     """
     This is the recursive class of A* algorithm
-  
+
+    g(n) is carried on the search states and updated by the traversed edge. If ``validate_every`` is set, the
+    incremental g(n) of every ``validate_every``-th generated state is checked against ``Data.calculate_objective``.
+
+    h(n) is provided by the given heuristic (see ``Heuristic.HEURISTICS``), which is ``"shortest_path"`` by default.
+    The solution is optimal only with an admissible heuristic, e.g., ``"mst+trip_count"``.
+
+    The memo table can be bounded by ``memo_memory`` bytes, evicting by ``memo_policy`` (see ``Memo``). An initial
+    incumbent can be given by ``initial_solution`` (see ``Solver.warm_start``).
     """
-    def __init__(self, data: Data):
+    def __init__(self, data: Data, validate_every: int = 0, heuristic: Union[str, Heuristic] = "shortest_path",
+                 memo_memory: Optional[int] = None, memo_policy: str = "lru",
+                 initial_solution: Optional[Union[Solution, Sequence[int]]] = None):
         super().__init__(data)
+        self.depot = self.data.depot_node
         self.priority_queue = PriorityQueue()
-        self.optimal_sol = [self.data.depot_node]
+        self.optimal_sol = [self.depot]
         self.optimal_dist = float("inf")
+        self.store_mask = self.data.store_mask
+        self.depot_mask = 1 << self.depot.id
         self.iteration = 0
-        self.memo ={}
-    
+        self.generated = 0
+        self.validate_every = validate_every
+        self.heuristic = make_heuristic(heuristic, self.data)
+        self.exact = self.heuristic.admissible
+        self.memo = Memo(memo_memory, memo_policy)
+
+        if initial_solution is not None:
+            self.warm_start(initial_solution)
+
     def solve(self) -> Solution:
-        self.priority_queue.enqueue([self.data.depot_node],0)
-        visited = set([self.data.depot_node])
-        self.astar(0,0,visited)
+        if self.stats is not None:
+            self.stats.start()
+
+        root = State.root(self.depot)
+        self.priority_queue.enqueue(root,0)
+        self.astar()
+
+        if self.stats is not None:
+            self.stats.finish()
         print("Iterations:", self.iteration)
         return self.optimal_sol
     
-    def astar(self, cumulative_load: float, total_dist: float, visited: set):
+    def astar(self):
         if self.priority_queue.is_empty():
             return
         
-        prior_track = self.priority_queue.dequeue()
-        expanding_node = prior_track[-1]
+        stats = self.stats
+        prior_state = self.priority_queue.dequeue()
+        expanding_node = prior_state.node
+        total_dist = prior_state.cost
 
-        # Memoization check 
-        nodes_set = frozenset(node.id for node in prior_track)
-        memo_key =(nodes_set, cumulative_load)
+        # Memoization check
+        memo_key = self.memo.key(prior_state.mask, expanding_node.id, prior_state.load)
+        if stats is not None:
+            stats.memo(memo_key in self.memo)
 
-        if memo_key in self.memo and self.memo[memo_key]<= total_dist:
+        if self.memo.prune(memo_key, total_dist, prior_state.load):
+            if stats is not None:
+                stats.prune("memo")
             return
-        self.memo[memo_key] = total_dist
             
-        min_return_cost = min([self.data.get_distance(expanding_node, self.data.depot_node)] + [self.data.get_distance(expanding_node, n) for n in self.data.nodes if n not in visited])
+        unvisited = self.store_mask & ~prior_state.mask
+        min_return_cost = self.data.cheapest_edge(expanding_node.id, unvisited | self.depot_mask) if unvisited or expanding_node.is_store else 0
 
         if total_dist + min_return_cost >= self.optimal_dist:
+            if stats is not None:
+                stats.prune("bound")
             return
 
-        if self.is_all_visited(prior_track):
-                prior_track = prior_track + [self.data.depot_node]
-                prior_track_cost = total_dist + self.data.get_distance(expanding_node,self.data.depot_node)
+        if self.is_all_visited(prior_state):
+                prior_track = prior_state.track + [self.depot]
+                prior_track_cost = total_dist + self.data.get_distance(expanding_node,self.depot)
                 if prior_track_cost < self.optimal_dist and self.data.is_feasible(prior_track):
-                    self.optimal_sol = list(prior_track)
+                    self.optimal_sol = prior_track
                     self.optimal_dist = prior_track_cost
+                    if stats is not None:
+                        stats.incumbent(prior_track_cost)
                     return
                 
         self.iteration+=1            
+        if self.budget is not None:
+            self.budget.check(self.iteration)
+        if stats is not None:
+            stats.expand(len(prior_state))
         for successor in self.data.nodes:
             if successor == expanding_node:
                 continue
             
-            if successor in visited and successor != self.data.depot_node:
+            if successor in prior_state and successor.is_store:
                 continue
 
-            new_track = prior_track + [successor]
-            gn = self.data.calculate_objective(new_track)
-            fn = self.shortest_path_heuristic(successor, [node for node in self.data.store_nodes if node not in prior_track])
+            new_mask = prior_state.mask | (1 << successor.id)
+            new_load = prior_state.load + successor.load
+
+            gn = total_dist + self.data.get_distance(expanding_node, successor)
+            if stats is None:
+                fn = self.heuristic(successor, self.store_mask & ~new_mask, new_load if successor.is_store else 0)
+            else:
+                fn = stats.heuristic(self.heuristic, successor, self.store_mask & ~new_mask, new_load if successor.is_store else 0)
             new_obj_func = gn +fn
 
             if new_obj_func >= self.optimal_dist:
+                if stats is not None:
+                    stats.prune("bound")
                 continue
 
-            new_visited = visited.copy()
-            new_visited.add(successor)
-            new_load = cumulative_load + successor.load
+            if stats is not None and successor.is_store and new_load > self.data.load_limit:
+                stats.prune("capacity")
 
-            if successor.is_store and new_load <= self.data.vehicle_capacity:
-                self.priority_queue.enqueue(new_track, new_obj_func)
-                self.astar(cumulative_load + successor.load, new_obj_func, new_visited)
+            if successor.is_store and new_load <= self.data.load_limit:
+                new_state = prior_state.child(successor, new_load, gn)
+                self.validate_cost(new_state)
+                if stats is not None:
+                    stats.generated += 1
+                self.priority_queue.enqueue(new_state, new_obj_func)
+                self.astar()
 
             elif successor.is_depot:
-                self.priority_queue.enqueue(new_track, new_obj_func)
-                self.astar(0, new_obj_func, new_visited)
-    
-
-    def is_all_visited (self, track: List[Node]) -> bool:
-        return set(self.data.store_nodes).issubset(set(track))
-    
+                new_state = prior_state.child(successor, 0, gn)
+                self.validate_cost(new_state)
+                if stats is not None:
+                    stats.generated += 1
+                self.priority_queue.enqueue(new_state, new_obj_func)
+                self.astar()
     
-    def shortest_path_heuristic(self, initial_node, unvisited_nodes):
-        #This heuristic approach uses the Dijkstra shortest path algorithm to find shortest path between unvisited nodes
-        priorty_queue = PriorityQueue()
-        priorty_queue.enqueue((initial_node,0),0)
-        edges = {node.id: float('inf') for node in unvisited_nodes}
-        edges[initial_node.id] = 0 
-        unvisited_nodes += [initial_node]
-
-        while not priorty_queue.is_empty():
-            node, node_cost = priorty_queue.dequeue()
-            for neighbor_node in unvisited_nodes:
-                cost_of_edge = node_cost + self.data.get_distance(node,neighbor_node)
-                if cost_of_edge < edges[neighbor_node.id]:
-                    edges[neighbor_node.id] = cost_of_edge
-                    priorty_queue.enqueue((neighbor_node,cost_of_edge), cost_of_edge)
-        
-        shortest_path = sum(edges[node.id] for node in unvisited_nodes if node.id in edges)
-        return shortest_path
-    
-
-
 
+    def is_all_visited (self, state: State) -> bool:
+        return state.mask & self.store_mask == self.store_mask
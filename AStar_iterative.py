@@ -1,133 +1,146 @@
-from typing import List
+from typing import Optional, Sequence, Union
 from Data import Data
-from Node import Node
+from Heuristic import Heuristic, make_heuristic
+from Memo import Memo
 from PriorityQueue import PriorityQueue
 from Solver import Solver, Solution
+from State import State
 
 class AStar_itearative(Solver):
     """
     This is the iterative class for AStar algorithm
+
+    g(n) is carried on the search states and updated by the traversed edge. If ``validate_every`` is set, the
+    incremental g(n) of every ``validate_every``-th generated state is checked against ``Data.calculate_objective``.
+
+    h(n) is provided by the given heuristic (see ``Heuristic.HEURISTICS``), which is ``"shortest_path"`` by default.
+    The solution is optimal only with an admissible heuristic, e.g., ``"mst+trip_count"``.
+
+    The memo table can be bounded by ``memo_memory`` bytes, evicting by ``memo_policy`` (see ``Memo``). An initial
+    incumbent can be given by ``initial_solution`` (see ``Solver.warm_start``).
     """
-    def __init__(self, data: Data):
+    def __init__(self, data: Data, validate_every: int = 0, heuristic: Union[str, Heuristic] = "shortest_path",
+                 memo_memory: Optional[int] = None, memo_policy: str = "lru",
+                 initial_solution: Optional[Union[Solution, Sequence[int]]] = None):
         super().__init__(data)
+        self.depot = self.data.depot_node
         self.priority_queue = PriorityQueue()
-        self.optimal_sol = [self.data.depot_node]
+        self.optimal_sol = [self.depot]
         self.optimal_dist = float("inf")
+        self.store_mask = self.data.store_mask
+        self.depot_mask = 1 << self.depot.id
         self.iteration = 0
-        self.memo = {}
-    
+        self.generated = 0
+        self.validate_every = validate_every
+        self.heuristic = make_heuristic(heuristic, self.data)
+        self.exact = self.heuristic.admissible
+        self.memo = Memo(memo_memory, memo_policy)
+
+        if initial_solution is not None:
+            self.warm_start(initial_solution)
+
     def solve(self) -> Solution:
-        self.priority_queue.enqueue(([self.data.depot_node],0,0), 0)
-        visited = set([self.data.depot_node.id])
+        stats = self.stats
+        if stats is not None:
+            stats.start()
+
+        self.priority_queue.enqueue(State.root(self.depot), 0)
 
       
         while not self.priority_queue.is_empty():
-            prior_track, prior_track_cost, prior_track_load = self.priority_queue.dequeue()
-            expanding_node = prior_track[-1]
+            if self.budget is not None:
+                self.budget.check(self.iteration)
 
-            # Memoization check 
-            nodes_set = frozenset(node.id for node in prior_track)
-            memo_key =(nodes_set, prior_track_load)
+            prior_state = self.priority_queue.dequeue()
+            prior_track_cost = prior_state.cost
+            expanding_node = prior_state.node
 
-            if memo_key in self.memo and self.memo[memo_key]<= prior_track_cost:
+            # Memoization check
+            memo_key = self.memo.key(prior_state.mask, expanding_node.id, prior_state.load)
+            if stats is not None:
+                stats.memo(memo_key in self.memo)
+
+            if self.memo.prune(memo_key, prior_track_cost, prior_state.load):
+                if stats is not None:
+                    stats.prune("memo")
                 continue
-            self.memo[memo_key] = prior_track_cost
             
-            min_return_cost = min([self.data.get_distance(expanding_node, self.data.depot_node)] + [self.data.get_distance(expanding_node, n) for n in self.data.nodes if n not in visited])
+            unvisited = self.store_mask & ~prior_state.mask
+            min_return_cost = self.data.cheapest_edge(expanding_node.id, unvisited | self.depot_mask) if unvisited or expanding_node.is_store else 0
 
             if prior_track_cost + min_return_cost >= self.optimal_dist:
+               if stats is not None:
+                   stats.prune("bound")
                continue
 
 
-            if self.is_all_visited(prior_track):
-                prior_track = prior_track + [self.data.depot_node]
-                prior_track_cost = prior_track_cost + self.data.get_distance(expanding_node,self.data.depot_node)
+            if self.is_all_visited(prior_state):
+                prior_track = prior_state.track + [self.depot]
+                prior_track_cost = prior_track_cost + self.data.get_distance(expanding_node,self.depot)
                 if prior_track_cost < self.optimal_dist and self.data.is_feasible(prior_track):
-                  self.optimal_sol = list(prior_track)
+                  self.optimal_sol = prior_track
                   self.optimal_dist = prior_track_cost
+                  if stats is not None:
+                      stats.incumbent(prior_track_cost)
                   continue
             
             self.iteration+=1
+            if stats is not None:
+                stats.expand(len(self.priority_queue))
             for successor in self.data.nodes:
                 if successor == expanding_node:
                     continue
-                if successor not in prior_track or successor.is_depot:
+                if successor not in prior_state or successor.is_depot:
                     # g(n) +f(n)
                     #new_obj_func = prior_track_cost + self.data.get_distance(expanding_node,successor)
                     #new_heuristic_cost = self.min_span_tree_heuristic(successor, prior_track + [successor],data)
-                    new_track = prior_track + [successor]
-                    gn = self.data.calculate_objective(new_track)
-                    fn = self.shortest_path_heuristic(successor, [node for node in self.data.store_nodes if node not in prior_track])
+                    new_mask = prior_state.mask | (1 << successor.id)
+                    new_load = prior_state.load + successor.load
+
+                    gn = prior_track_cost + self.data.get_distance(expanding_node,successor)
+                    if stats is None:
+                        fn = self.heuristic(successor, self.store_mask & ~new_mask, new_load if successor.is_store else 0)
+                    else:
+                        fn = stats.heuristic(self.heuristic, successor, self.store_mask & ~new_mask, new_load if successor.is_store else 0)
                     new_obj_func = gn +fn
 
                     if new_obj_func >= self.optimal_dist:
+                        if stats is not None:
+                            stats.prune("bound")
                         continue
-                    
-                    new_load = prior_track_load + successor.load
-
-                    if successor.is_store and new_load <= self.data.vehicle_capacity:
-                        visited.add(expanding_node) 
-                        self.priority_queue.enqueue((new_track,new_obj_func,new_load),new_obj_func)
-                        
-                    elif successor.is_depot: # and new_load + min_load > self.data.vehicle_capacity: 
-                        visited.add(expanding_node)
-                        self.priority_queue.enqueue((new_track,new_obj_func,0),new_obj_func)
+
+                    if stats is not None and successor.is_store and new_load > self.data.load_limit:
+                        stats.prune("capacity")
+
+                    if successor.is_store and new_load <= self.data.load_limit:
+                        new_state = prior_state.child(successor, new_load, gn)
+                        self.validate_cost(new_state)
+                        if stats is not None:
+                            stats.generated += 1
+                        self.priority_queue.enqueue(new_state,new_obj_func)
+
+                    elif successor.is_depot: # and new_load + min_load > self.data.vehicle_capacity:
+                        new_state = prior_state.child(successor, 0, gn)
+                        self.validate_cost(new_state)
+                        if stats is not None:
+                            stats.generated += 1
+                        self.priority_queue.enqueue(new_state,new_obj_func)
             
+        if stats is not None:
+            stats.finish()
         print("Iterations:", self.iteration)
         return self.optimal_sol
     
 
-    def is_all_visited (self, track: List[Node]) -> bool:
-        return set(self.data.store_nodes).issubset(set(track))
-     
-    def shortest_path_heuristic(self, initial_node, unvisited_nodes):
-        #This heuristic approach uses the Dijkstra shortest path algorithm to find shortest path between unvisited nodes
-        priorty_queue = PriorityQueue()
-        priorty_queue.enqueue((initial_node,0),0)
-        edges = {node.id: float('inf') for node in unvisited_nodes}
-        edges[initial_node.id] = 0 
-        unvisited_nodes += [initial_node]
-
-        while not priorty_queue.is_empty():
-            node, node_cost = priorty_queue.dequeue()
-            for neighbor_node in unvisited_nodes:
-                cost_of_edge = node_cost + self.data.get_distance(node,neighbor_node)
-                if cost_of_edge < edges[neighbor_node.id]:
-                    edges[neighbor_node.id] = cost_of_edge
-                    priorty_queue.enqueue((neighbor_node,cost_of_edge), cost_of_edge)
-        
-        shortest_path = sum(edges[node.id] for node in unvisited_nodes if node.id in edges)
-        return shortest_path
-   
-
-    
-    def minimum_spanning_tree_heuristic(self,current_node, unvisited_nodes):
-        #This Heuristic approach uses Prim's algorithm to calculate minimum spanning tree between unvisited nodes.
-        min_cost = 0
-        edges = PriorityQueue()
-        visited_nodes = set()
-        visited_nodes.add(current_node.id)
-
-        for node in self.data.nodes:
-            if node.id != current_node.id and node in unvisited_nodes:
-              edge_cost =self.data.get_distance(current_node, node)
-              edges.enqueue((node,edge_cost), edge_cost) 
-        while edges:
-          node, cost = edges.dequeue()
-          if node.id not in visited_nodes:
-              visited_nodes.add(node)
-              min_cost += cost
-              for next_node in self.data.nodes:
-                  if next_node.id not in visited_nodes and next_node in unvisited_nodes:
-                      edges.enqueue((next_node, self.data.get_distance(node, next_node)), self.data.get_distance(node, next_node))
-        return min_cost
-
-    
-
-
-
-
+    def lower_bound(self) -> float:
+        # Every route not found yet passes through a state in the queue, whose g(n) + h(n) is a lower bound of the route
+        # if the heuristic is admissible
+        if not self.exact:
+            return super().lower_bound()
 
+        frontier = self.priority_queue.peek_value() if self.priority_queue else float("inf")
 
+        return max(super().lower_bound(), min(frontier, self.optimal_dist))
 
-   
\ No newline at end of file
+    def is_all_visited (self, state: State) -> bool:
+        return state.mask & self.store_mask == self.store_mask
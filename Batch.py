@@ -0,0 +1,166 @@
+import contextlib
+import io
+import json
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Type, Union
+from Data import Data
+from LocalSearch import LocalSearch
+from Solver import Solver
+
+
+def solve_many(paths_or_data: Iterable[Union[str, Data]], solver_class: Type[Solver], workers: int = 1,
+               output: Optional[TextIO] = None, max_in_flight: Optional[int] = None, local_search: bool = False,
+               warm_start: Optional[Type[Solver]] = None, **solver_kwargs) -> Iterator[Dict]:
+    """
+        This function solves many problem instances with the given solver class in a process pool, and yields a record
+        for each instance as soon as it is solved (i.e., not in the given order).
+
+        Instances are consumed lazily from ``paths_or_data``, and at most ``max_in_flight`` instances (``2 * workers``
+        by default) are submitted at once, so that the memory usage is bounded for long streams. The worker processes
+        are reused across the instances, so the solver modules are imported once per worker. A pickle path is loaded
+        in the worker, while a *Data* object is sent to the worker.
+
+        If ``warm_start`` is set, each instance is solved by that solver class first (e.g., ``ClarkeWright``), and its
+        feasible solution is the initial incumbent of the solver (see ``Solver.warm_start``).
+
+        If ``local_search`` is set, each feasible solution is improved by ``LocalSearch`` in the worker, and the time
+        includes the improvement.
+
+        If an instance fails (e.g., its file cannot be loaded, or the worker process dies), its record has the
+        ``"error"`` status with the representation of the exception, and the other instances are still solved. When a
+        worker process dies, the pool fails every instance in flight, so the pool is rebuilt, and those instances are
+        solved again one at a time. The instance killing a worker while it is solved alone gets the error record.
+
+        Each record is also written to ``output`` (if given) as a JSON line.
+
+        :param paths_or_data: Pickle file paths, or *Data* objects
+        :param solver_class: *Solver* class
+        :param workers: Number of worker processes
+        :param output: Optional output stream for the JSON line records
+        :param max_in_flight: Maximum number of instances submitted at once
+        :param local_search: Whether the solutions are improved by local search, or not
+        :param warm_start: Optional solver class providing the initial incumbents
+        :param solver_kwargs: Additional arguments for the solver constructor
+        :return: Records with ``Instance`` and ``Status``, and ``Feasibility``, ``Objective``, ``Iterations``,
+            ``Time`` and ``Route`` if the status is ``"ok"``, or ``Error`` otherwise
+    """
+    max_in_flight = max_in_flight or 2 * workers
+    instances = enumerate(paths_or_data)
+    suspects = deque()  # Instances in flight when a worker process died, which are solved one at a time
+    executor = ProcessPoolExecutor(workers)
+    generation = 0      # Number of the rebuilt pools
+    in_flight = {}      # Instances and the generations of their pools by their futures
+
+    try:
+        while True:
+            if suspects:
+                submitted = [] if in_flight else [suspects.popleft()]
+            else:
+                submitted = list(islice(instances, max_in_flight - len(in_flight)))
+
+            for index, instance in submitted:
+                try:
+                    future = executor.submit(_solve_instance, index, instance, solver_class, solver_kwargs,
+                                             local_search, warm_start)
+                except BrokenProcessPool:
+                    # A worker process has died since the last wait
+                    executor.shutdown(wait=False)
+                    executor = ProcessPoolExecutor(workers)
+                    generation += 1
+                    future = executor.submit(_solve_instance, index, instance, solver_class, solver_kwargs,
+                                             local_search, warm_start)
+
+                in_flight[future] = index, instance, generation
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            records = []
+            broken = []
+
+            for future in done:
+                _collect(future, in_flight.pop(future), records, broken)
+
+            if any(broken_generation == generation for _, _, broken_generation in broken):
+                # The other instances in flight fail as well, or have just finished
+                victims = [future for future, (_, _, future_generation) in in_flight.items()
+                           if future_generation == generation]
+
+                for future in wait(victims)[0]:
+                    _collect(future, in_flight.pop(future), records, broken)
+
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(workers)
+                generation += 1
+
+            if len(broken) == 1:
+                index, instance, _ = broken[0]
+                records.append(_error_record(index, instance, BrokenProcessPool("the worker process died")))
+            else:
+                suspects.extend((index, instance) for index, instance, _ in broken)
+
+            for record in records:
+                if output is not None:
+                    output.write(json.dumps(record) + "\n")
+                    output.flush()
+
+                yield record
+    finally:
+        executor.shutdown()
+
+
+def _collect(future: Future, item: Tuple[int, Union[str, Data], int], records: List[Dict], broken: List[Tuple]):
+    # Adding the record of a finished instance, or the instance to the broken ones if its worker process died
+    index, instance, generation = item
+
+    try:
+        records.append(future.result())
+    except BrokenProcessPool:
+        broken.append((index, instance, generation))
+    except Exception as exception:
+        records.append(_error_record(index, instance, exception))
+
+
+def _error_record(index: int, instance: Union[str, Data], exception: BaseException) -> Dict:
+    # The record of a failed instance
+    return {
+        "Instance": instance if isinstance(instance, str) else index,
+        "Status": "error",
+        "Error": repr(exception),
+    }
+
+
+def _solve_instance(index: int, instance: Union[str, Data], solver_class: Type[Solver], solver_kwargs: Dict,
+                    local_search: bool = False, warm_start: Optional[Type[Solver]] = None) -> Dict:
+    # Solving a single instance in the worker process
+    data = Data(instance) if isinstance(instance, str) else instance
+    solver = solver_class(data, **solver_kwargs)
+
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if warm_start is not None:
+            initial_solution = warm_start(data).solve()
+
+            if data.is_feasible(initial_solution):
+                solver.warm_start(initial_solution)
+
+        solution = solver.solve()
+
+    if local_search and data.is_feasible(solution):
+        solution = LocalSearch(data).improve(solution)
+    end_time = time.perf_counter()
+
+    return {
+        "Instance": instance if isinstance(instance, str) else index,
+        "Status": "ok",
+        "Feasibility": data.is_feasible(solution),
+        "Objective": data.calculate_objective(solution),
+        "Iterations": getattr(solver, "iteration", None),
+        "Time": end_time - start_time,
+        "Route": [node.id for node in solution],
+    }
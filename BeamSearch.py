@@ -0,0 +1,151 @@
+from typing import Optional, Union
+import numpy as np
+from Data import Data
+from Heuristic import Heuristic, make_heuristic
+from Memo import Memo
+from Solver import Solver, Solution
+from State import State
+
+
+class BeamSearch(Solver):
+    """
+    This is the beam search class, i.e., a best-first search keeping at most ``width`` states at each level.
+
+    The successors are generated and pruned as in UCS_iterative: a successor is an unvisited store fitting into the
+    vehicle or the depot, and it is pruned by the incumbent and the memo table. Each level is scored at once over the
+    rows of the distance matrix (see ``Heuristic.rows``), i.e., g(n) of all the (state, successor) pairs of the level
+    is a single NumPy expression, and the geometric data does not compute the dense matrix. Only the successors
+    passing the capacity check are scored by the heuristic (see ``Heuristic.HEURISTICS``), also at once by
+    ``Heuristic.batch``.
+    The ``width`` successors having the lowest g(n) + h(n) form the next level.
+
+    The running time is bounded by O(N * width * N) successors for N nodes, but the solution is not guaranteed to be
+    optimal. A larger ``width`` gives better solutions in more time.
+    """
+    def __init__(self, data: Data, width: int = 64, heuristic: Union[str, Heuristic] = "mst+trip_count",
+                 memo_memory: Optional[int] = None, memo_policy: str = "lru"):
+        super().__init__(data)
+        self.width = width
+        self.heuristic = make_heuristic(heuristic, self.data)
+        self.optimal_sol = [self.data.depot_node]
+        self.optimal_dist = float("inf")
+        self.store_mask = self.data.store_mask
+        self.iteration = 0
+        self.memo = Memo(memo_memory, memo_policy)
+
+        nodes = self.data.nodes
+        self.loads = np.array([node.load for node in nodes], dtype=np.float64)
+        self.is_depot = np.array([node.is_depot for node in nodes])
+        depot_id = self.data.depot_node.id
+        self.returns = self.data.distances_from(depot_id) if self.data.coordinates is not None else \
+            self.data.distance_matrix[:, depot_id]
+
+    def solve(self) -> Solution:
+        stats = self.stats
+        if stats is not None:
+            stats.start()
+
+        depot = self.data.depot_node
+        number_of_nodes = len(self.data.nodes)
+        capacity = self.data.load_limit
+        ids = np.arange(number_of_nodes)
+
+        # The beam as arrays, along with the states for the reconstruction
+        states = [State.root(depot)]
+        visited = np.zeros((1, number_of_nodes), dtype=bool)
+        visited[0, depot.id] = True
+
+        while states:
+            if self.budget is not None:
+                self.budget.check(self.iteration)
+
+            self.iteration += len(states)
+            if stats is not None:
+                for _ in states:
+                    stats.expand(len(states))
+
+            current = np.array([state.node.id for state in states])
+            loads = np.array([state.load for state in states])
+            costs = np.array([state.cost for state in states])
+
+            # g(n) and the load of every (state, successor) pair of the level
+            gn = costs[:, None] + self.heuristic.rows(current)
+            new_loads = np.where(self.is_depot, 0., loads[:, None] + self.loads)
+            allowed = (~visited | self.is_depot) & (ids != current[:, None]) & (new_loads <= capacity) \
+                & (gn < self.optimal_dist)
+
+            if stats is not None:
+                stats.prune("capacity", int(((~visited | self.is_depot) & (new_loads > capacity)).sum()))
+
+            parents, successors = np.nonzero(allowed)
+            successor_visited = visited[parents]
+            successor_visited[np.arange(len(parents)), successors] = True
+
+            # Completed routes return to the depot
+            complete = successor_visited[:, ~self.is_depot].all(axis=1)
+
+            if complete.any():
+                totals = gn[parents[complete], successors[complete]] + self.returns[successors[complete]]
+                best = int(np.argmin(totals))
+
+                if totals[best] < self.optimal_dist:
+                    state = states[parents[complete][best]]
+                    node = self.data.nodes[successors[complete][best]]
+                    track = state.child(node, 0., totals[best]).track
+                    track += [] if node.is_depot else [depot]
+
+                    if self.data.is_feasible(track):
+                        self.optimal_sol = track
+                        self.optimal_dist = self.data.calculate_objective(track)
+                        if stats is not None:
+                            stats.incumbent(self.optimal_dist)
+
+            parents, successors = parents[~complete], successors[~complete]
+            successor_visited = successor_visited[~complete]
+
+            # f(n) = g(n) + h(n), the heuristic estimates the remaining successors of the level at once
+            unvisited = ~successor_visited & ~self.is_depot
+            successor_loads = new_loads[parents, successors]
+            hn = self.heuristic.batch(successors, unvisited, successor_loads) if stats is None else \
+                stats.heuristic(self.heuristic.batch, successors, unvisited, successor_loads)
+            fn = gn[parents, successors] + hn
+
+            # The next level: the best successors, which are not dominated by a previous one
+            next_states = []
+            next_rows = []
+
+            for rank, i in enumerate(np.argsort(fn, kind="stable").tolist()):
+                if fn[i] >= self.optimal_dist:
+                    if stats is not None:
+                        stats.prune("bound", len(fn) - rank)
+                    break
+
+                parent, successor = int(parents[i]), int(successors[i])
+                state = states[parent].child(self.data.nodes[successor], float(new_loads[parent, successor]),
+                                             float(gn[parent, successor]))
+
+                memo_key = self.memo.key(state.mask, successor, state.load)
+                if stats is not None:
+                    stats.memo(memo_key in self.memo)
+
+                if self.memo.prune(memo_key, state.cost, state.load):
+                    if stats is not None:
+                        stats.prune("memo")
+                    continue
+
+                if stats is not None:
+                    stats.generated += 1
+
+                next_states.append(state)
+                next_rows.append(i)
+
+                if len(next_states) == self.width:
+                    break
+
+            states = next_states
+            visited = successor_visited[next_rows]
+
+        if stats is not None:
+            stats.finish()
+        print("Iterations:", self.iteration)
+        return self.optimal_sol
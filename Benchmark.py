@@ -0,0 +1,375 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence, Type
+import numpy as np
+from Data import Data
+from AStar_iterative import AStar_itearative
+from AStar import AStar
+from IDAStar import IDAStar
+from UCS_iterative import UCS_iterative
+from UCS import UCS
+from DFS import DFS
+from GreedyDFS import GreedyDFS
+from BeamSearch import BeamSearch
+from ClarkeWright import ClarkeWright
+from HeldKarp import HeldKarp
+from RandomSolver import RandomSolver
+from Solver import Solver
+
+
+SOLVERS: Dict[str, Type[Solver]] = {
+    "HeldKarp": HeldKarp,
+    "AStar_itearative": AStar_itearative,
+    "AStar": AStar,
+    "IDAStar": IDAStar,
+    "GreedyDFS": GreedyDFS,
+    "BeamSearch": BeamSearch,
+    "ClarkeWright": ClarkeWright,
+    "DFS": DFS,
+    "UCS": UCS,
+    "UCS_iterative": UCS_iterative,
+    "RandomSolver": RandomSolver,
+}
+"""
+    Benchmarked solvers by their names.
+"""
+
+SOLVER_KWARGS: Dict[str, Dict] = {
+    "RandomSolver": {"seed": 12},
+}
+"""
+    Constructor arguments of the solvers, so that the benchmark is reproducible.
+"""
+
+REFERENCE_SOLVER = "HeldKarp"  #: Exact solver providing the optimal objective for the gaps
+
+
+def compare_heuristics(data: Data, heuristics: Sequence[str] = ("shortest_path", "mst"),
+                       solver_class: Type[Solver] = AStar_itearative) -> List[Dict]:
+    """
+        This function solves the given data with an A* solver for each heuristic, and compares the number of
+        expansions and the elapsed time.
+
+        :param data: Target problem data
+        :param heuristics: Names of the heuristics (see ``Heuristic.HEURISTICS``)
+        :param solver_class: A* solver class accepting the ``heuristic`` argument
+        :return: A record for each heuristic
+    """
+    records = []
+
+    for heuristic in heuristics:
+        solver = solver_class(data, heuristic=heuristic)
+
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            solution = solver.solve()
+        end_time = time.perf_counter()
+
+        records.append({
+            "Heuristic": heuristic,
+            "Feasibility": data.is_feasible(solution),
+            "Objective": data.calculate_objective(solution),
+            "Expansions": solver.iteration,
+            "Time": end_time - start_time,
+        })
+
+    return records
+
+
+def compare_memo_limits(data: Data, limits: Sequence[Optional[int]] = (None, 1 << 24, 1 << 20),
+                        policies: Sequence[str] = ("lru", "lowest_cost"),
+                        solver_class: Type[Solver] = DFS) -> List[Dict]:
+    """
+        This function solves the given data with a solver for each memory limit and eviction policy of the memo table,
+        and compares the memo statistics, the number of expansions and the elapsed time.
+
+        :param data: Target problem data
+        :param limits: Maximum memories of the memo table in bytes, ``None`` for no limit
+        :param policies: Eviction policies (see ``Memo.POLICIES``)
+        :param solver_class: Solver class accepting the ``memo_memory`` and ``memo_policy`` arguments
+        :return: A record for each (limit, policy) pair
+    """
+    records = []
+
+    for limit in limits:
+        for policy in policies:
+            solver = solver_class(data, memo_memory=limit, memo_policy=policy)
+
+            start_time = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                solution = solver.solve()
+            end_time = time.perf_counter()
+
+            records.append({
+                **solver.memo.as_dict(),
+                "Feasibility": data.is_feasible(solution),
+                "Objective": data.calculate_objective(solution),
+                "Expansions": solver.iteration,
+                "Time": end_time - start_time,
+            })
+
+    return records
+
+
+def compare_workers(data: Data, workers: Sequence[int] = (1, 2, 4), split_depth: int = 2) -> List[Dict]:
+    """
+        This function solves the given data with the parallel DFS for each number of workers, and compares the number
+        of expansions and the elapsed time with the first one (i.e., the speedup). The speedup is bounded by the number
+        of CPUs, which is also reported.
+
+        :param data: Target problem data
+        :param workers: Numbers of worker processes, the first one is the reference
+        :param split_depth: Depth of the work units (see ``DFS``)
+        :return: A record for each number of workers
+    """
+    records = []
+
+    for count in workers:
+        solver = DFS(data, workers=count, split_depth=split_depth)
+
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            solution = solver.solve()
+        end_time = time.perf_counter()
+
+        records.append({
+            "Workers": count,
+            "CPUs": os.cpu_count(),
+            "Feasibility": data.is_feasible(solution),
+            "Objective": data.calculate_objective(solution),
+            "Expansions": solver.iteration,
+            "Time": end_time - start_time,
+            "ExpansionRatio": solver.iteration / records[0]["Expansions"] if records else 1.,
+            "Speedup": records[0]["Time"] / (end_time - start_time) if records else 1.,
+        })
+
+    return records
+
+
+def benchmark_instances(file_paths: Sequence[str] = ("small.pkl", "medium.pkl", "large.pkl"),
+                        sizes: Sequence[int] = (6, 8, 10, 12), seed: int = 12) -> Dict[str, Data]:
+    """
+        This function provides the benchmark instances: the given pickle files, and the seeded random instances of the
+        given numbers of stores.
+
+        :param file_paths: Paths of the pickle files
+        :param sizes: Numbers of stores of the random instances
+        :param seed: Random seed
+        :return: Instances by their names
+    """
+    instances = {file_path: Data(file_path) for file_path in file_paths}
+
+    for size in sizes:
+        instances[f"random-{size}-{seed}"] = Data.generate_random(size, seed=seed)
+
+    return instances
+
+
+def run_benchmark(instances: Dict[str, Data], solvers: Optional[Dict[str, Type[Solver]]] = None, repeats: int = 5,
+                  timeout: float = 60.) -> List[Dict]:
+    """
+        This function runs each solver on each instance ``repeats`` times, and reports the median and 95th percentile
+        of the elapsed times, the number of iterations, the peak memory and the optimality gap.
+
+        Each (instance, solver) pair runs in its own process. The peak memory is measured by ``tracemalloc`` in an
+        additional run, so that tracing does not affect the elapsed times. If a run exceeds ``timeout`` seconds, the
+        process is terminated and the record has the ``"timeout"`` status.
+
+        :param instances: Instances by their names
+        :param solvers: Solvers by their names, all solvers by default
+        :param repeats: Number of timed runs
+        :param timeout: Maximum seconds for a single run
+        :return: A record for each (instance, solver) pair
+    """
+    solvers = solvers if solvers is not None else SOLVERS
+    records = []
+
+    for instance_name, data in instances.items():
+        instance_records = [_benchmark(instance_name, data, solver_name, solver_class, repeats, timeout)
+                            for solver_name, solver_class in solvers.items()]
+
+        # Optimality gap with respect to the exact solver, or the best found objective
+        references = [record["Objective"] for record in instance_records
+                      if record["Solver"] == REFERENCE_SOLVER and record["Status"] == "ok"]
+        references = references or [record["Objective"] for record in instance_records
+                                    if record["Status"] == "ok" and record["Feasibility"]]
+
+        for record in instance_records:
+            if references and record["Status"] == "ok" and record["Feasibility"]:
+                record["Gap"] = max(0., (record["Objective"] - min(references)) / min(references))
+
+        records += instance_records
+
+    return records
+
+
+def compare_to_baseline(records: List[Dict], baseline: List[Dict], tolerance: float = 0.25,
+                        gap_tolerance: float = 1e-6, time_floor: float = 1e-3) -> List[str]:
+    """
+        This function compares the benchmark records with the baseline records of the same (instance, solver) pairs.
+
+        :param records: Current benchmark records
+        :param baseline: Baseline benchmark records
+        :param tolerance: Allowed relative increase of the median time
+        :param gap_tolerance: Allowed increase of the optimality gap
+        :param time_floor: Allowed absolute increase of the median time in seconds, against the timing noise
+        :return: Descriptions of the regressions
+    """
+    baseline_records = {(record["Instance"], record["Solver"]): record for record in baseline}
+    regressions = []
+
+    for record in records:
+        previous = baseline_records.get((record["Instance"], record["Solver"]))
+
+        if previous is None:
+            continue
+
+        name = f"{record['Solver']} on {record['Instance']}"
+
+        if previous["Status"] == "ok" and record["Status"] != "ok":
+            regressions.append(f"{name}: {record['Status']}")
+            continue
+
+        if record["Status"] != "ok" or previous["Status"] != "ok":
+            continue
+
+        if record["MedianTime"] > max(previous["MedianTime"] * (1 + tolerance), previous["MedianTime"] + time_floor):
+            regressions.append(f"{name}: median time {previous['MedianTime']:.4f} -> {record['MedianTime']:.4f} sec")
+
+        if record.get("Gap") is not None and previous.get("Gap") is not None \
+                and record["Gap"] > previous["Gap"] + gap_tolerance:
+            regressions.append(f"{name}: gap {previous['Gap']:.4%} -> {record['Gap']:.4%}")
+
+    return regressions
+
+
+def _benchmark(instance_name: str, data: Data, solver_name: str, solver_class: Type[Solver], repeats: int,
+               timeout: float) -> Dict:
+    # Running the benchmark of an (instance, solver) pair in a separate process
+    record = {"Instance": instance_name, "Solver": solver_name, "Status": "ok", "Gap": None}
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_runs, args=(sender, data, solver_class,
+                                                          SOLVER_KWARGS.get(solver_name, {}), repeats))
+    process.start()
+    sender.close()
+
+    times = []
+    peak_memory = None
+
+    try:
+        for _ in range(repeats + 1):
+            if not receiver.poll(timeout):
+                record["Status"] = "timeout"
+                break
+
+            message = receiver.recv()
+
+            if message[0] == "time":
+                _, elapsed, iterations, objective, feasibility = message
+                times.append(elapsed)
+                record.update({"Iterations": iterations, "Objective": objective, "Feasibility": feasibility})
+            elif message[0] == "memory":
+                peak_memory = message[1]
+            else:
+                record["Status"] = "error"
+                record["Error"] = message[1]
+                break
+    except EOFError:
+        record["Status"] = "error"
+        record["Error"] = f"exit code {process.exitcode}"
+    finally:
+        process.terminate()
+        process.join()
+
+    if record["Status"] == "ok":
+        record["MedianTime"] = float(np.median(times))
+        record["P95Time"] = float(np.percentile(times, 95))
+        record["PeakMemory"] = peak_memory
+
+    return record
+
+
+def _runs(sender, data: Data, solver_class: Type[Solver], solver_kwargs: Dict, repeats: int):
+    # Timed runs and the memory run in the benchmark process
+    sys.setrecursionlimit(100000)
+
+    try:
+        for _ in range(repeats):
+            solver = solver_class(data, **solver_kwargs)
+
+            start_time = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                solution = solver.solve()
+            end_time = time.perf_counter()
+
+            sender.send(("time", end_time - start_time, getattr(solver, "iteration", None),
+                         data.calculate_objective(solution), data.is_feasible(solution)))
+
+        tracemalloc.start()
+        solver = solver_class(data, **solver_kwargs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver.solve()
+        sender.send(("memory", tracemalloc.get_traced_memory()[1]))
+        tracemalloc.stop()
+    except Exception as exception:
+        sender.send(("error", repr(exception)))
+
+
+if __name__ == "__main__":
+    # Such as "python Benchmark.py --solvers HeldKarp DFS --output results.json --baseline baseline.json"
+    parser = argparse.ArgumentParser(description="Benchmark of the solvers")
+    parser.add_argument("--files", nargs="*", default=["small.pkl", "medium.pkl", "large.pkl"])
+    parser.add_argument("--sizes", nargs="*", type=int, default=[6, 8, 10, 12])
+    parser.add_argument("--seed", type=int, default=12)
+    parser.add_argument("--solvers", nargs="*", default=list(SOLVERS), choices=list(SOLVERS))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.)
+    parser.add_argument("--output", help="Path of the JSON output")
+    parser.add_argument("--baseline", help="Path of the JSON baseline to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative increase of the median time")
+    parser.add_argument("--workers", nargs="*", type=int,
+                        help="Numbers of workers to compare the parallel DFS on the files, such as 1 2 4")
+    args = parser.parse_args()
+
+    if args.workers:
+        for file_path in args.files:
+            for record in compare_workers(Data(file_path), args.workers):
+                print(f"{file_path:<16} Workers: {record['Workers']}  CPUs: {record['CPUs']}  "
+                      f"Expansions: {record['Expansions']} ({record['ExpansionRatio']:.2f}x)  "
+                      f"Time: {record['Time']:.4f}  Speedup: {record['Speedup']:.2f}x  "
+                      f"Objective: {record['Objective']:.3f}")
+
+        sys.exit(0)
+
+    results = run_benchmark(benchmark_instances(args.files, args.sizes, args.seed),
+                            {name: SOLVERS[name] for name in args.solvers}, args.repeats, args.timeout)
+
+    for result in results:
+        if result["Status"] != "ok":
+            print(f"{result['Instance']:<16} {result['Solver']:<18} {result['Status']}")
+            continue
+
+        print(f"{result['Instance']:<16} {result['Solver']:<18} Median: {result['MedianTime']:.4f}  "
+              f"P95: {result['P95Time']:.4f}  Iterations: {result['Iterations']}  "
+              f"Peak Memory: {result['PeakMemory']}  Objective: {result['Objective']:.3f}  "
+              f"Gap: {'-' if result['Gap'] is None else format(result['Gap'], '.2%')}")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+
+        for regression in regressions:
+            print("Regression:", regression)
+
+        sys.exit(1 if regressions else 0)
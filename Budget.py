@@ -0,0 +1,131 @@
+import os
+import time
+from typing import NamedTuple, Optional
+from Data import Solution
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+class BudgetExhausted(Exception):
+    """
+        This exception is raised by ``Budget.check`` to stop the search, when a budget runs out.
+    """
+    reason: str  #: Exhausted budget, i.e., ``"time"``, ``"expansions"`` or ``"memory"``
+
+    def __init__(self, reason: str):
+        super().__init__(f"{reason} budget is exhausted")
+
+        self.reason = reason
+
+    def __reduce__(self):
+        # The reason is the only argument, e.g., when the exception is raised in a worker process
+        return BudgetExhausted, (self.reason,)
+
+
+class AnytimeResult(NamedTuple):
+    """
+        This class holds the result of an anytime solve (see ``Solver.solve_anytime``).
+
+        The gap is relative to the lower bound, i.e., ``(objective - lower_bound) / lower_bound``, so it bounds the
+        optimality gap reported by the benchmark from above.
+    """
+    solution: Solution      #: Best solution found (i.e., incumbent), empty if there is none
+    objective: float        #: Objective of the incumbent, ``inf`` if there is none
+    lower_bound: float      #: Proven lower bound of the optimal objective
+    gap: float              #: Relative gap between the objective and the lower bound
+    complete: bool          #: Whether the search has finished within the budgets
+    reason: Optional[str]   #: Exhausted budget, ``None`` if the search is complete
+
+
+class Budget:
+    """
+        This class limits the search by wall-clock time, number of expansions and memory. The solvers call ``check``
+        at each expansion, which raises ``BudgetExhausted`` when a budget runs out.
+
+        The memory budget is the growth of the resident memory of the process during the search. Since reading the
+        resident memory is much more costly than reading the clock, it is checked only every ``memory_interval``
+        expansions.
+    """
+    time_limit: Optional[float]     #: Maximum seconds of the search
+    max_expansions: Optional[int]   #: Maximum number of expansions
+    max_memory: Optional[int]       #: Maximum growth of the resident memory in bytes
+    memory_interval: int            #: Number of expansions between the memory checks
+
+    def __init__(self, time_limit: Optional[float] = None, max_expansions: Optional[int] = None,
+                 max_memory: Optional[int] = None, memory_interval: int = 1024):
+        """
+            Constructor
+
+            :param time_limit: Maximum seconds of the search, no limit by default
+            :param max_expansions: Maximum number of expansions, no limit by default
+            :param max_memory: Maximum growth of the resident memory in bytes, no limit by default
+            :param memory_interval: Number of expansions between the memory checks
+        """
+        self.time_limit = time_limit
+        self.max_expansions = max_expansions
+        self.max_memory = max_memory
+        self.memory_interval = memory_interval
+        self.start()
+
+    def start(self):
+        """
+            This method starts the budgets at the beginning of the search.
+        """
+        self.__deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        self.__memory_limit = self.resident_memory() + self.max_memory if self.max_memory is not None else None
+        self.__checks = 0
+
+    def check(self, expansions: int):
+        """
+            This method checks the budgets.
+
+            :param expansions: Number of expansions so far
+        """
+        if self.max_expansions is not None and expansions >= self.max_expansions:
+            raise BudgetExhausted("expansions")
+
+        if self.__deadline is not None and time.perf_counter() >= self.__deadline:
+            raise BudgetExhausted("time")
+
+        self.__checks += 1
+
+        if self.__memory_limit is not None and self.__checks % self.memory_interval == 0 \
+                and self.resident_memory() >= self.__memory_limit:
+            raise BudgetExhausted("memory")
+
+    def remaining(self) -> Optional[float]:
+        """
+            This method provides the seconds left until the time budget runs out, e.g., to wait for the worker
+            processes.
+
+            :return: Remaining seconds, not less than zero, ``None`` without a time limit
+        """
+        if self.__deadline is None:
+            return None
+
+        return max(0., self.__deadline - time.perf_counter())
+
+    @staticmethod
+    def resident_memory() -> int:
+        """
+            This method provides the resident memory of the process in bytes. If the current value is not available
+            (i.e., not on Linux), the peak value is provided instead.
+
+            :return: Resident memory in bytes
+        """
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):
+            pass
+
+        if resource is None:
+            return 0
+
+        # Kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
@@ -0,0 +1,101 @@
+import numpy as np
+from Data import Data
+from Solver import Solver, Solution
+
+
+class ClarkeWright(Solver):
+    """
+    This is the constructive solver based on the Clarke-Wright savings algorithm.
+
+    Initially, each store is served by its own trip from the depot. Joining the trip ending at store i with the trip
+    starting at store j saves ``d(i, depot) + d(depot, j) - d(i, j)``. The savings of all the (i, j) pairs are computed
+    at once over the distance matrix and sorted in decreasing order, then the trips are joined greedily in that order
+    whenever i ends a trip, j starts another one and the joined trip fits into the vehicle capacity (i.e.,
+    ``Data.load_limit``). The direction of each edge is kept, so it also works for asymmetric distances.
+
+    It takes O(N^2 log N) time for N stores, and the ties are broken by the store order, so the solution is
+    deterministic. It is not optimal, but it provides an initial incumbent for the exact solvers in a few
+    milliseconds (see ``Solver.warm_start``).
+    """
+    def __init__(self, data: Data):
+        super().__init__(data)
+        self.optimal_sol = [self.data.depot_node]
+        self.optimal_dist = float("inf")
+        self.stores = list(self.data.store_nodes)
+        self.iteration = 0
+
+    def solve(self) -> Solution:
+        if self.stats is not None:
+            self.stats.start()
+
+        number_of_stores = len(self.stores)
+        ids = self.data.store_ids
+        depot_id = self.data.depot_node.id
+        distances = self.data.distance_matrix
+        capacity = self.data.load_limit
+
+        # Savings of joining the trip ending at i with the trip starting at j
+        savings = distances[ids, depot_id][:, None] + distances[depot_id, ids][None, :] - distances[np.ix_(ids, ids)]
+        np.fill_diagonal(savings, -np.inf)
+
+        order = np.argsort(-savings, axis=None, kind="stable")
+        order = order[:np.count_nonzero(savings > 0)]
+        sources, targets = np.unravel_index(order, savings.shape)
+
+        # Trips as linked lists of the store indices
+        following = [-1] * number_of_stores
+        trip_of = list(range(number_of_stores))
+        starts = list(range(number_of_stores))
+        ends = list(range(number_of_stores))
+        loads = [node.load for node in self.stores]
+
+        for i, j in zip(sources.tolist(), targets.tolist()):
+            self.iteration += 1
+            if self.budget is not None:
+                self.budget.check(self.iteration)
+
+            first, second = trip_of[i], trip_of[j]
+
+            if first == second or ends[first] != i or starts[second] != j or loads[first] + loads[second] > capacity:
+                continue
+
+            following[i] = j
+            ends[first] = ends[second]
+            loads[first] += loads[second]
+
+            while j != -1:
+                trip_of[j] = first
+                j = following[j]
+
+        # Trips in the order of their first stores
+        solution = [self.data.depot_node]
+
+        for trip in sorted(set(trip_of), key=lambda trip: starts[trip]):
+            store = starts[trip]
+
+            while store != -1:
+                solution.append(self.stores[store])
+                store = following[store]
+
+            solution.append(self.data.depot_node)
+
+        # The joined loads are checked against the same limit as ``Data.is_feasible``, otherwise the route falls back
+        # to a trip for each store, or to the previous route
+        if not self.data.is_feasible(solution):
+            print("Clarke-Wright route is not feasible, it falls back to a trip for each store")
+            solution = [self.data.depot_node]
+
+            for store in self.stores:
+                solution += [store, self.data.depot_node]
+
+        if self.data.is_feasible(solution):
+            self.optimal_sol = solution
+            self.optimal_dist = self.data.calculate_objective(solution)
+
+            if self.stats is not None:
+                self.stats.incumbent(self.optimal_dist)
+
+        if self.stats is not None:
+            self.stats.finish()
+        print("Iterations:", self.iteration)
+        return self.optimal_sol
@@ -0,0 +1,28 @@
+import argparse
+from Data import Data
+
+
+def convert(source: str, target: str, binary: bool = True):
+    """
+        This function converts an instance file between the pickle and the binary formats (see ``Data.load_binary``).
+        The source format is detected by the file itself.
+
+        :param source: The path of the source file
+        :param target: The path of the target file
+        :param binary: Whether the target is a binary file, or a pickle file
+    """
+    data = Data(source)
+
+    if binary:
+        data.save_binary(target)
+    else:
+        data.save(target)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert instance files between the pickle and binary formats.")
+    parser.add_argument("source", help="Source instance file (.pkl or binary)")
+    parser.add_argument("target", help="Target instance file, a pickle file if it ends with .pkl, binary otherwise")
+    args = parser.parse_args()
+
+    convert(args.source, args.target, binary=not args.target.endswith(".pkl"))
@@ -1,7 +1,15 @@
-from typing import List
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from multiprocessing import Value
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+from Budget import Budget, BudgetExhausted
 from Data import Data
+from Memo import Memo
 from Node import Node
 from Solver import Solver, Solution
+from Stats import Stats
 
 
 class DFS(Solver):
@@ -10,17 +18,43 @@ class DFS(Solver):
         this class.
 
         >> *Note*: You are free to make changes (i.e., defining variables and methods) in this class.
+
+        If ``workers`` is more than one, the search tree is split into work units at the first ``split_depth`` levels
+        below the depot, and the units are solved by a process pool. The distance of the best solution (i.e.,
+        incumbent) is shared through a shared-memory value, so that every worker prunes against the global best.
+        In the parallel mode, the budgets of ``solve_anytime`` are checked between the work units, and the pending
+        units are cancelled when a budget runs out. The deadline of the time budget and the remaining expansions are
+        also given to the workers, and the results of the units are awaited only until the deadline. The units
+        stopped by a budget still return their best routes so far.
+
+        In the parallel mode, each worker keeps its memo table across its units, and the entries recorded by a finished
+        unit are passed to the other workers with their next units, so that they also prune the states dominated by
+        the searched ones. A unit per worker is pending at a time, so that the units get the latest entries.
+
+        The memo table can be bounded by ``memo_memory`` bytes, evicting by ``memo_policy`` (see ``Memo``). In the
+        parallel mode, the bound applies to the table of each worker. An initial incumbent can be given by
+        ``initial_solution`` (see ``Solver.warm_start``), which is also shared with the workers.
     """
+    exact = True
 
-    def __init__(self, data: Data):
+    def __init__(self, data: Data, workers: int = 1, split_depth: int = 2, memo_memory: Optional[int] = None,
+                 memo_policy: str = "lru", initial_solution: Optional[Union[Solution, Sequence[int]]] = None):
         super().__init__(data)
-        self.optimal_sol = [self.data.depot_node]
+        self.depot = self.data.depot_node
+        self.optimal_sol = [self.depot]
         self.optimal_dist = float("inf")
-        self.visited = set([self.data.depot_node])
-        self.max_load = max(node.load for node in self.data.nodes if node.is_store)
-        #self.min_load = min(node.load for node in self.data.nodes if node.is_store)
+        self.store_mask = self.data.store_mask
+        self.depot_mask = 1 << self.depot.id
         self.iteration = 0
-        self.memo = {}
+        self.memo = Memo(memo_memory, memo_policy)
+        self.workers = workers
+        self.split_depth = split_depth
+        self.memo_memory = memo_memory
+        self.memo_policy = memo_policy
+        self.incumbent = None
+
+        if initial_solution is not None:
+            self.warm_start(initial_solution)
 
     def solve(self) -> Solution:
         """
@@ -30,73 +64,262 @@ class DFS(Solver):
 
             :return: Solution found by DFS
         """
-        self.dfs([self.data.depot_node],0,0)
+        if self.stats is not None:
+            self.stats.start()
+
+        if self.workers > 1:
+            self.parallel_dfs()
+        else:
+            self.dfs([self.depot],0,0,1 << self.depot.id)
+
+        if self.stats is not None:
+            self.stats.finish()
         print("Iterations: ", self.iteration)
         return self.optimal_sol
     
     
-    def dfs(self, track:List[Node], total_dist: float, cumulative_load: float):
+    def dfs(self, track:List[Node], total_dist: float, cumulative_load: float, mask: int):
+        stats = self.stats
+
+        # Parallel mode: prune against the global best
+        if self.incumbent is not None and self.incumbent.get_obj().value < self.optimal_dist:
+            self.optimal_dist = self.incumbent.get_obj().value
 
         # Memoization check
-        nodes_set = frozenset(node.id for node in track)
-        memo_key =(nodes_set, cumulative_load)
+        memo_key = self.memo.key(mask, track[-1].id, cumulative_load)
+        if stats is not None:
+            stats.memo(memo_key in self.memo)
 
-        if memo_key in self.memo and self.memo[memo_key]<= total_dist:
+        if self.memo.prune(memo_key, total_dist, cumulative_load):
+            if stats is not None:
+                stats.prune("memo")
             return
-        self.memo[memo_key] = total_dist
  
         last_in_node = track[-1]
-        min_return_cost = min([self.data.get_distance(last_in_node, self.data.depot_node)] + [self.data.get_distance(last_in_node, n) for n in self.data.nodes if n not in self.visited])
+        unvisited = self.store_mask & ~mask
+        min_return_cost = self.data.cheapest_edge(last_in_node.id, unvisited | self.depot_mask) if unvisited or last_in_node.is_store else 0
         
         #optimizasyon: gereksiz tracklere girme
         if total_dist + min_return_cost  >= self.optimal_dist:
+            if stats is not None:
+                stats.prune("bound")
             return
         
         #initial check is all nodes are visited
-        if len(track) > 1 and last_in_node == self.data.depot_node and self.is_all_visited(track):
+        if len(track) > 1 and last_in_node.is_depot and self.is_all_visited(mask):
             if total_dist < self.optimal_dist:
                 if self.data.is_feasible(track):
                     self.optimal_sol = list(track)
                     self.optimal_dist = total_dist
+                    self.share_incumbent()
+                    if stats is not None:
+                        stats.incumbent(total_dist)
             return
         
         self.iteration+=1 
+        if self.budget is not None:
+            self.budget.check(self.iteration)
+        if stats is not None:
+            stats.expand(len(track))
         #Expand
-        nodes_to_check = [ node for node in self.data.nodes if node not in track or node.is_depot]
+        for successor_node, distance, new_load in self.successors(track, total_dist, cumulative_load, mask):
+            if stats is not None:
+                stats.generated += 1
+            track.append(successor_node)
+            self.dfs(track, total_dist + distance, new_load, mask | (1 << successor_node.id))
+            track.pop()
+
+    def successors(self, track: List[Node], total_dist: float, cumulative_load: float, mask: int) -> Iterator[Tuple[Node, float, float]]:
+        # Successors are generated lazily, so that each one is checked against the latest incumbent
+        last_in_node = track[-1]
+        nodes_to_check = [self.data.nodes[i] for i in self.data.nearest_neighbours(last_in_node.id)
+                          if not (mask >> i) & 1 or (self.depot_mask >> i) & 1]
         for successor_node in nodes_to_check:
-            if successor_node not in track or successor_node == self.data.depot_node:
+            if not (mask >> successor_node.id) & 1 or successor_node.is_depot:
                 if successor_node == last_in_node:
                     continue
                 distance = self.data.get_distance(last_in_node, successor_node)
 
                 if total_dist + distance >= self.optimal_dist:
+                  if self.stats is not None:
+                      self.stats.prune("bound")
                   continue
 
                 new_load = cumulative_load + successor_node.load
 
-                if new_load > self.data.vehicle_capacity:
+                if new_load > self.data.load_limit:
+                    if self.stats is not None:
+                        self.stats.prune("capacity")
                     continue
-            
-                if successor_node.is_store and new_load <= self.data.vehicle_capacity:
-                    track.append(successor_node)
-                    self.dfs(track, total_dist + distance , cumulative_load + successor_node.load)
-                    self.visited.add(last_in_node)
-                    track.pop()
-                 
-                elif successor_node.is_depot and new_load + self.max_load > self.data.vehicle_capacity:
-                    track.append(successor_node)
-                    self.dfs(track, total_dist + distance , 0)
-                    self.visited.add(last_in_node)
-                    track.pop()
 
+                if successor_node.is_store and new_load <= self.data.load_limit:
+                    yield successor_node, distance, new_load
+
+                elif successor_node.is_depot:
+                    yield successor_node, distance, 0
+
+    def parallel_dfs(self):
+        incumbent = Value("d", self.optimal_dist)
+        remaining = self.budget.remaining() if self.budget is not None else None
+        # Wall-clock time, since the clock of time.perf_counter may differ between the processes
+        deadline = time.time() + remaining if remaining is not None else None
+
+        units = iter(self.work_units())
+        entries: List[Tuple[int, Dict[Hashable, object]]] = []  # Memo entries of the finished units by their workers
+        first_version = 0   # Version of entries[0], the older ones have been merged by every worker
+        versions = {}       # Versions of the entries merged by the workers, by their process ids
+
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.data, incumbent, self.memo_memory, self.memo_policy)) as executor:
+            pending = set()
+
+            try:
+                while True:
+                    # A unit per worker, so that each unit is given the memo entries of the units finished before it
+                    for unit in islice(units, self.workers - len(pending)):
+                        version = min(versions.values()) if len(versions) == self.workers else first_version
+                        pending.add(executor.submit(_solve_unit, unit, deadline, self.stats is not None, version,
+                                                    entries[version - first_version:], self.remaining_expansions()))
+
+                    if not pending:
+                        break
+
+                    done, pending = wait(pending, timeout=self.budget.remaining() if self.budget is not None else None,
+                                         return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        track_ids, iteration, stats, changes, worker, version = future.result()
+                        self.take_unit(track_ids, iteration, stats)
+                        versions[worker] = version
+
+                        if changes:
+                            entries.append((worker, changes))
+
+                    if len(versions) == self.workers:
+                        del entries[:min(versions.values()) - first_version]
+                        first_version = min(versions.values())
+
+                    # Also raises when the deadline has passed without a finished unit
+                    if self.budget is not None:
+                        self.budget.check(self.iteration)
+            except BudgetExhausted as exhausted:
+                # The running units stop at the deadline by themselves, and return their incumbents so far. The other
+                # budgets are only checked here, so an unbeatable incumbent stops the units, which keeps their routes.
+                for future in pending:
+                    future.cancel()
+
+                if exhausted.reason != "time":
+                    incumbent.value = -float("inf")
+
+                for future in wait(pending)[0]:
+                    if not future.cancelled() and future.exception() is None:
+                        self.take_unit(*future.result()[:3])
+
+                incumbent.value = -float("inf")
+                raise
+            except BaseException:
+                # An unbeatable incumbent makes the running units return immediately
+                incumbent.value = -float("inf")
+                executor.shutdown(cancel_futures=True)
+                raise
+
+    def remaining_expansions(self) -> Optional[int]:
+        # Expansions left in the budget, which also bound a work unit
+        if self.budget is None or self.budget.max_expansions is None:
+            return None
+
+        return max(0, self.budget.max_expansions - self.iteration)
+
+    def take_unit(self, track_ids: List[int], iteration: int, stats: Optional[Stats]):
+        # The result of a work unit: its best route is taken if it is better than the incumbent
+        self.iteration += iteration
+        track = [self.data.nodes[i] for i in track_ids]
+
+        if stats is not None:
+            self.stats.merge(stats)
+
+        if len(track) > 1 and self.data.calculate_objective(track) < self.optimal_dist:
+            self.optimal_sol = track
+            self.optimal_dist = self.data.calculate_objective(track)
+            if self.stats is not None:
+                self.stats.incumbent(self.optimal_dist)
+
+    def work_units(self) -> List[List[int]]:
+        # Tracks of the first levels below the depot, in the expansion order of DFS
+        units = []
+        stack = [([self.depot], 0, 0, 1 << self.depot.id)]
+
+        while stack:
+            track, total_dist, cumulative_load, mask = stack.pop()
+
+            if len(track) > self.split_depth or self.is_all_visited(mask):
+                units.append([node.id for node in track])
+                continue
+
+            children = [(track + [successor_node], total_dist + distance, new_load, mask | (1 << successor_node.id))
+                        for successor_node, distance, new_load in self.successors(track, total_dist, cumulative_load, mask)]
+            stack.extend(reversed(children))
+
+        return units
+
+    def share_incumbent(self):
+        if self.incumbent is None:
+            return
+
+        with self.incumbent.get_lock():
+            if self.optimal_dist < self.incumbent.value:
+                self.incumbent.value = self.optimal_dist
+
+
+    def is_all_visited (self, mask: int) -> bool:
+        return mask & self.store_mask == self.store_mask
+
+
+_worker: Optional[DFS] = None  #: DFS solver of the worker process
+_version = 0  #: Version of the memo entries merged by the worker process
+
+
+def _init_worker(data: Data, incumbent, memo_memory: Optional[int], memo_policy: str):
+    global _worker
+
+    _worker = DFS(data, memo_memory=memo_memory, memo_policy=memo_policy)
+    _worker.memo = Memo(memo_memory, memo_policy, track_changes=True)
+    _worker.incumbent = incumbent
+
+
+def _solve_unit(unit: List[int], deadline: Optional[float] = None, stats: bool = False, version: int = 0,
+                entries: Sequence[Tuple[int, Dict[Hashable, object]]] = (),
+                max_expansions: Optional[int] = None) -> Tuple[List[int], int, Optional[Stats], Dict[Hashable, object],
+                                                               int, int]:
+    # Solving a work unit in the worker process, after merging the memo entries of the units finished by the others.
+    # The entries have the versions from the given one, and the ones merged before are skipped.
+    global _version
+
+    for worker, changes in entries[max(0, _version - version):]:
+        if worker != os.getpid():
+            _worker.memo.merge(changes)
 
+    _version = max(_version, version + len(entries))
+    _worker.budget = Budget(deadline - time.time() if deadline is not None else None,
+                            _worker.iteration + max_expansions if max_expansions is not None else None)
+    _worker.stats = Stats() if stats else None
+    track = [_worker.data.nodes[i] for i in unit]
+    iteration = _worker.iteration
 
-    def is_all_visited (self, path: List[Node]) -> bool:
-        store_nodes = set(self.data.store_nodes)
-        for store in store_nodes:
-            if store not in path:
-                return False
-        return True
+    total_dist = _worker.data.calculate_objective(track)
+    cumulative_load = 0
+    mask = 0
 
+    for node in track:
+        cumulative_load = 0 if node.is_depot else cumulative_load + node.load
+        mask |= 1 << node.id
 
+    try:
+        _worker.dfs(track, total_dist, cumulative_load, mask)
+        changes = _worker.memo.changes()
+    except BudgetExhausted:
+        # The incumbent so far is still returned, but the states of the interrupted unit are not searched completely
+        _worker.memo.changes()
+        changes = {}
 
+    return ([node.id for node in _worker.optimal_sol], _worker.iteration - iteration, _worker.stats, changes,
+            os.getpid(), _version)
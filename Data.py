@@ -1,7 +1,11 @@
 from __future__ import annotations
-from random import Random
-from typing import List, Optional, Union, Dict, TypeVar, Sequence
+import os
+import struct
+from collections import OrderedDict
+from typing import Callable, Iterator, List, Optional, Tuple, Union, Dict, TypeVar, Sequence
+from KDTree import KDTree
 from Node import Node
+import numpy as np
 import pickle as pkl
 
 
@@ -10,21 +14,91 @@ Solution = TypeVar("Solution", bound=Sequence[Node])
     Solution format is a sequence, indicating the traveling path.
 """
 
+ROUTE_PAD = -1  #: Padding of the routes in a padded route array (see ``Data.pad_routes``)
+
+LOAD_TOLERANCE = 1e-9
+"""
+    Relative tolerance of the capacity checks (see ``Data.load_limit``). It absorbs the floating point errors of the
+    load sums, which depend on the summation order, and it is far below the resolution of the loads.
+"""
+
+BINARY_MAGIC = b"CVRPBIN\0"  #: First bytes of a binary instance file
+BINARY_VERSION = 1            #: Version of the binary instance format
+
+BINARY_HEADER = struct.Struct("<8sIId8x")
+"""
+    Header of a binary instance file: the magic bytes, the format version, the number of nodes N, the vehicle load
+    capacity and padding, 32 bytes in total. It is followed by the (N x N) distance matrix and the N loads, both as
+    little-endian float64 arrays, so that the matrix can be memory-mapped as it is.
+"""
+
+
+class _Rows(dict):
+    """
+        Rows of a matrix as Python lists (e.g., the distances or the sorted neighbours), computed on the first lookup of
+        each row by the given function. It is a dictionary, so the lookups of the computed rows do not pay a Python
+        call.
+    """
+    def __init__(self, compute: Callable[[int], List]):
+        super().__init__()
+        self.compute = compute
+
+    def __missing__(self, i: int) -> List:
+        row = self.compute(i)
+        self[i] = row
+
+        return row
+
+
+class _LruRows(OrderedDict):
+    """
+        Rows of a matrix as Python lists, computed on the lookup of each row by the given function, which keeps at most
+        ``max_rows`` rows by evicting the least recently used one.
+    """
+    def __init__(self, compute: Callable[[int], List], max_rows: int):
+        super().__init__()
+        self.compute = compute
+        self.max_rows = max_rows
+
+    def __getitem__(self, i: int) -> List:
+        if i in self:
+            self.move_to_end(i)
+            return super().__getitem__(i)
+
+        row = self.compute(i)
+        self[i] = row
+
+        if len(self) > self.max_rows:
+            self.popitem(last=False)
+
+        return row
+
 
 class Data:
     """
         Data class holds the necessary parameters for the problem. Also, it can generate a random problem. Lastly,
         it can provide the validity (i.e., feasibility) and the objective value (i.e., max-span) of a given solution.
     """
-    __distance_matrix: Dict[int, Dict[int, float]]  #: Distance matrix
-    __nodes: List[Node]                             #: List of nodes
-    __vehicle_capacity: float                       #: Vehicle load capacity
+    __matrix: Optional[np.ndarray]          #: Dense distance matrix indexed by node ids
+    __coordinates: Optional[np.ndarray]     #: Coordinates of the nodes for the geometric data, indexed by node ids
+    __tree: Optional[KDTree]                #: Spatial index of the coordinates for the geometric data
+    __cache_rows: Optional[int]             #: Maximum number of cached rows for the geometric data, ``None`` for all
+    __rows: Dict[int, List[float]]          #: Rows of the distance matrix as Python lists for scalar lookups
+    __neighbours: Dict[int, List[int]]      #: Other node ids of each node, sorted by ascending distance
+    __min_edges: Optional[np.ndarray]       #: Cheapest outgoing edge of each node, computed on the first access
+    __binary_path: Optional[str]            #: Absolute path of the memory-mapped binary file, if any
+    __nodes: List[Node]                     #: List of nodes
+    __depot_node: Optional[Node]            #: Depot node
+    __store_nodes: Tuple[Node, ...]         #: Store nodes
+    __store_ids: np.ndarray                 #: Ids of the store nodes
+    __store_mask: int                       #: Bitmask of the store nodes
+    __vehicle_capacity: float               #: Vehicle load capacity
 
     def __init__(self, file_path: Optional[str] = None):
         """
             Constructor.
-            If the file path is defined, it reads the parameters from the given pickle file. Otherwise, it initiates
-            empty parameters.
+            If the file path is defined, it reads the parameters from the given pickle or binary file (see ``load``).
+            Otherwise, it initiates empty parameters.
 
             :param file_path: If the file
         """
@@ -32,8 +106,8 @@ class Data:
             self.load(file_path)
         else:
             self.__nodes = []
-            self.__distance_matrix = {}
             self.__vehicle_capacity = 0.
+            self.__build_matrix({})
 
     def get_distance(self, node_source: Union[Node, int], node_target: Union[Node, int]) -> float:
         """
@@ -47,7 +121,107 @@ class Data:
         source_id = node_source if isinstance(node_source, int) else node_source.id
         target_id = node_target if isinstance(node_target, int) else node_target.id
 
-        return self.__distance_matrix[source_id][target_id]
+        return self.__rows[source_id][target_id]
+
+    def distance(self, source_id: int, target_id: int) -> float:
+        """
+            This method provides the distance from *source* node to *target* node by their ids. It is the fast variant
+            of ``get_distance`` for the inner loops of the solvers.
+
+            :param source_id: The source node id.
+            :param target_id: The target node id.
+            :return: Distance from *source* node to *target* node
+        """
+
+        return self.__rows[source_id][target_id]
+
+    def distances_from(self, node_id: int, ids: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+            This method provides the distances from the given node to the other nodes. Without ``ids``, the row of the
+            dense distance matrix is returned as a read-only view (i.e., without copying). For the geometric data, the
+            distances are computed from the coordinates at once.
+
+            :param node_id: The source node id.
+            :param ids: Optional target node ids.
+            :return: Distances from the source node, indexed by the target node ids, or ordered as ``ids``.
+        """
+        if self.__coordinates is not None:
+            targets = self.__coordinates if ids is None else self.__coordinates[ids]
+
+            return np.sqrt(((targets - self.__coordinates[node_id]) ** 2).sum(axis=1))
+
+        if ids is None:
+            return self.__matrix[node_id]
+
+        return self.__matrix[node_id, ids]
+
+    def nearest_neighbours(self, node_id: int) -> List[int]:
+        """
+            This method provides the other nodes sorted by their distances from the given node (i.e., nearest first).
+
+            :param node_id: The source node id.
+            :return: List of node ids
+        """
+
+        return self.__neighbours[node_id]
+
+    def nearest(self, node_id: int, k: int) -> List[int]:
+        """
+            This method provides the k nearest other nodes to the given node (i.e., nearest first). For the geometric
+            data, they are queried from the k-d tree (see ``KDTree``) without computing the distances to all nodes.
+
+            :param node_id: The source node id.
+            :param k: The number of nodes.
+            :return: List of node ids
+        """
+        if self.__tree is None:
+            return self.__neighbours[node_id][:k]
+
+        _, ids = self.__tree.query(self.__coordinates[node_id], k + 1)
+
+        return [i for i in ids if i != node_id][:k]
+
+    def cheapest_edge(self, node_id: int, mask: int) -> float:
+        """
+            This method provides the cheapest edge from the given node to any other node in the given bitmask. The
+            sorted neighbour list is scanned until the first node in the mask, so it usually stops after a few nodes.
+
+            :param node_id: The source node id.
+            :param mask: Bitmask of the target nodes, where the bit ``node.id`` is set for each target node.
+            :return: Distance of the cheapest edge, or ``inf`` if there is no target node.
+        """
+        for target_id in self.__neighbours[node_id]:
+            if (mask >> target_id) & 1:
+                return self.__rows[node_id][target_id]
+
+        return float("inf")
+
+    @property
+    def min_edges(self) -> np.ndarray:
+        """
+            This method provides the cheapest outgoing edge of each node, indexed by node ids, i.e., the table of
+            ``cheapest_edge`` towards all the other nodes. It is computed once, from the k-d tree for the geometric data.
+
+            :return: Cheapest outgoing edges
+        """
+        if self.__min_edges is None and self.__tree is not None:
+            min_edges = []
+
+            for i, point in enumerate(self.__coordinates):
+                distances, ids = self.__tree.query(point, 2)
+                min_edges.append(next((distance for distance, j in zip(distances, ids) if j != i), np.inf))
+
+            self.__min_edges = np.array(min_edges, dtype=np.float64)
+            self.__min_edges.flags.writeable = False
+
+        if self.__min_edges is None:
+            matrix = np.array(self.__matrix, dtype=np.float64)
+            np.fill_diagonal(matrix, np.inf)
+
+            self.__min_edges = matrix.min(axis=1) if len(matrix) else np.zeros(0, dtype=np.float64)
+            self.__min_edges.flags.writeable = False
+
+        return self.__min_edges
 
     def is_feasible(self, solution: Solution) -> bool:
         """
@@ -78,7 +252,7 @@ class Data:
                 if node in visited_nodes:  # Store nodes must be visited once
                     return False
 
-            if load > self.__vehicle_capacity:  # Cumulative load amount cannot exceed the vehicle load capacity
+            if load > self.load_limit:  # Cumulative load amount cannot exceed the vehicle load capacity
                 return False
 
             if node not in visited_nodes:
@@ -103,6 +277,102 @@ class Data:
 
         return total_distance
 
+    @staticmethod
+    def pad_routes(solutions: Sequence[Union[Solution, Sequence[int]]]) -> np.ndarray:
+        """
+            This method packs the given routes into a padded route array for the batch evaluation (see
+            ``are_feasible`` and ``calculate_objectives``).
+
+            :param solutions: Routes as sequences of nodes or node ids
+            :return: (R x L) integer array of the node ids, where L is the longest route, padded by ``ROUTE_PAD``
+        """
+        routes = np.full((len(solutions), max((len(solution) for solution in solutions), default=0)), ROUTE_PAD,
+                         dtype=np.int64)
+
+        for i, solution in enumerate(solutions):
+            routes[i, :len(solution)] = [node if isinstance(node, (int, np.integer)) else node.id for node in solution]
+
+        return routes
+
+    def are_feasible(self, routes: np.ndarray) -> np.ndarray:
+        """
+            This method checks the validity (i.e. feasibility) of many routes at once, with the same rules and results
+            as ``is_feasible``. The first and last nodes, the repeated and missing stores are checked over the whole
+            array, and the cumulative loads are updated for all the routes at each position.
+
+            :param routes: (R x L) padded route array (see ``pad_routes``)
+            :return: Whether each route is feasible, or not.
+        """
+        routes, valid = self.__check_routes(routes)
+        number_of_routes, length = routes.shape
+        rows = np.arange(number_of_routes)
+        is_depot = np.array([node.is_depot for node in self.__nodes], dtype=bool)
+        node_loads = np.array([node.load for node in self.__nodes], dtype=np.float64)
+
+        lengths = valid.sum(axis=1)
+        depots = is_depot[routes] & valid
+        stores = ~is_depot[routes] & valid
+
+        if length == 0:
+            return np.full(number_of_routes, len(self.__nodes) == 1)
+
+        # First and last nodes must be depot
+        feasible = (lengths == 0) | (depots[:, 0] & is_depot[routes[rows, np.maximum(lengths - 1, 0)]])
+
+        # Store nodes must be visited once, and all of them must be visited
+        visits = np.sort(np.where(stores, routes, -1), axis=1)
+        feasible &= ~((visits[:, 1:] == visits[:, :-1]) & (visits[:, 1:] >= 0)).any(axis=1)
+        feasible &= stores.sum(axis=1) == len(self.__nodes) - 1
+
+        # Cumulative load amount cannot exceed the vehicle load capacity, summed in the order of ``is_feasible``
+        entry_loads = np.where(stores, node_loads[routes], 0.)
+        loads = np.zeros(number_of_routes, dtype=np.float64)
+
+        for position in range(length):
+            loads = np.where(depots[:, position], 0., loads + entry_loads[:, position])
+            feasible &= loads <= self.load_limit
+
+        return feasible
+
+    def calculate_objectives(self, routes: np.ndarray) -> np.ndarray:
+        """
+            This method calculates the objective values (i.e., total travelling distances) of many routes at once. The
+            distances of all the edges are gathered at once, and summed in the order of ``calculate_objective`` (i.e.,
+            by a cumulative sum), so that the results are equal.
+
+            :param routes: (R x L) padded route array (see ``pad_routes``)
+            :return: Objective value of each route
+        """
+        routes, valid = self.__check_routes(routes)
+
+        if routes.shape[1] < 2:
+            return np.zeros(len(routes), dtype=np.float64)
+
+        sources, targets = routes[:, :-1], routes[:, 1:]
+
+        if self.__coordinates is not None:
+            distances = np.sqrt(((self.__coordinates[targets] - self.__coordinates[sources]) ** 2).sum(axis=-1))
+        else:
+            distances = self.__matrix[sources, targets]
+
+        return np.where(valid[:, 1:], distances, 0.).cumsum(axis=1)[:, -1]
+
+    def __check_routes(self, routes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+            This method checks a padded route array, where the padding must be at the end of each route.
+
+            :param routes: (R x L) padded route array (see ``pad_routes``)
+            :return: Route array where the padding is replaced by the depot, and the mask of the non-padding entries
+        """
+        routes = np.asarray(routes, dtype=np.int64)
+        valid = routes != ROUTE_PAD
+
+        assert routes.ndim == 2, "Routes must be a two-dimensional array"
+        assert not (~valid[:, :-1] & valid[:, 1:]).any(), "Padding must be at the end of each route"
+        assert ((routes[valid] >= 0) & (routes[valid] < len(self.__nodes))).all(), "Invalid node id in the routes"
+
+        return np.where(valid, routes, self.depot_node.id), valid
+
     @property
     def nodes(self) -> List[Node]:
         """
@@ -113,29 +383,75 @@ class Data:
 
         return self.__nodes
 
+    @property
+    def distance_matrix(self) -> np.ndarray:
+        """
+            This method provides the dense (N x N) distance matrix indexed by node ids. The matrix is read-only. For
+            the geometric data, it is computed on the first access, which takes O(N^2) memory.
+
+            :return: Distance matrix
+        """
+        if self.__matrix is None:
+            coordinates = self.__coordinates
+            matrix = np.zeros((len(coordinates), len(coordinates)), dtype=np.float64)
+
+            for dimension in range(coordinates.shape[1]):
+                matrix += (coordinates[:, dimension, None] - coordinates[None, :, dimension]) ** 2
+
+            self.__matrix = np.sqrt(matrix)
+            self.__matrix.flags.writeable = False
+
+        return self.__matrix
+
+    @property
+    def coordinates(self) -> Optional[np.ndarray]:
+        """
+            This method provides the coordinates of the nodes, indexed by node ids. The matrix is read-only.
+
+            :return: (N x D) coordinates for the geometric data, ``None`` otherwise
+        """
+
+        return self.__coordinates
+
     @property
     def depot_node(self) -> Node:
         """
-            This method provides the **depot** node
+            This method provides the **depot** node, which is found once when the nodes are set.
 
             :return: Depot node
         """
 
-        for node in self.__nodes:
-            if node.is_depot:
-                return node
+        return self.__depot_node
 
     @property
     def store_nodes(self) -> Sequence[Node]:
         """
-            This method provides the **store** nodes
+            This method provides the **store** nodes, which are found once when the nodes are set.
 
             :return: Store nodes
         """
 
-        for node in self.__nodes:
-            if node.is_store:
-                yield node
+        return self.__store_nodes
+
+    @property
+    def store_ids(self) -> np.ndarray:
+        """
+            This method provides the ids of the **store** nodes as a read-only array.
+
+            :return: Store node ids
+        """
+
+        return self.__store_ids
+
+    @property
+    def store_mask(self) -> int:
+        """
+            This method provides the bitmask of the **store** nodes, where the bit ``node.id`` is set for each store.
+
+            :return: Store nodes bitmask
+        """
+
+        return self.__store_mask
 
     @property
     def vehicle_capacity(self) -> float:
@@ -147,44 +463,143 @@ class Data:
 
         return self.__vehicle_capacity
 
+    @property
+    def load_limit(self) -> float:
+        """
+            This method provides the highest cumulative load passing the capacity check, i.e., the vehicle load capacity
+            with the relative tolerance ``LOAD_TOLERANCE``. The solvers check the capacity against it, so that they
+            agree with ``is_feasible`` whatever the order of the load sums is (e.g., a subset sum of the loads).
+
+            :return: Cumulative load limit
+        """
+
+        return self.__vehicle_capacity + LOAD_TOLERANCE * max(1., abs(self.__vehicle_capacity))
+
     def load(self, file_path: str):
         """
-            Loading the data from a **pickle** file
+            Loading the data from a **pickle** file, or from a binary file (see ``load_binary``), which is detected by
+            its first bytes.
 
             :param file_path: The path of the file
         """
+        if Data.is_binary(file_path):
+            self.load_binary(file_path)
+            return
+
         with open(file_path, "rb") as f:
             data = pkl.load(f)
 
-            self.__distance_matrix = data["DistanceMatrix"]
             self.__nodes = data["Nodes"]
             self.__vehicle_capacity = data["VehicleCapacity"]
 
+        if "Coordinates" in data:
+            self.__set_coordinates(data["Coordinates"], data.get("CacheRows"))
+        else:
+            self.__build_matrix(data["DistanceMatrix"])
+
     def save(self, file_path: str):
         """
-            Save this data into a **pickle** file
+            Save this data into a **pickle** file. The geometric data is saved with its coordinates instead of the
+            distance matrix.
 
             :param file_path: The path of the file
         """
+        if self.__coordinates is not None:
+            with open(file_path, "wb") as f:
+                pkl.dump({
+                    "Coordinates": self.__coordinates,
+                    "CacheRows": self.__cache_rows,
+                    "Nodes": self.__nodes,
+                    "VehicleCapacity": self.__vehicle_capacity
+                }, f)
+
+            return
+
+        rows = self.__matrix.tolist()
+
         with open(file_path, "wb") as f:
             pkl.dump({
-                "DistanceMatrix": self.__distance_matrix,
+                "DistanceMatrix": {i: dict(enumerate(row)) for i, row in enumerate(rows)},
                 "Nodes": self.__nodes,
                 "VehicleCapacity": self.__vehicle_capacity
             }, f)
 
     @staticmethod
-    def generate_random(number_of_stores: int, vehicle_capacity: float = 50., seed: Optional[int] = 12,
+    def is_binary(file_path: str) -> bool:
+        """
+            This method checks whether the given file is a binary instance file (see ``BINARY_HEADER``).
+
+            :param file_path: The path of the file
+            :return: Whether the file starts with ``BINARY_MAGIC``, or not.
+        """
+        with open(file_path, "rb") as f:
+            return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+    def load_binary(self, file_path: str, mmap: bool = True):
+        """
+            Loading the data from a **binary** file (see ``BINARY_HEADER``). Unlike the pickle files, nothing in the
+            file is executed. With ``mmap``, the distance matrix is memory-mapped read-only, so loading does not read
+            the matrix, and the processes loading the same file share its pages. The rows are converted for the scalar
+            lookups on their first use.
+
+            :param file_path: The path of the file
+            :param mmap: Whether the distance matrix is memory-mapped, or read into memory
+        """
+        with open(file_path, "rb") as f:
+            magic, version, number_of_nodes, vehicle_capacity = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))
+
+        assert magic == BINARY_MAGIC, f"Not a binary instance file: {file_path}"
+        assert version == BINARY_VERSION, f"Unsupported binary instance version: {version}"
+
+        matrix_size = number_of_nodes * number_of_nodes
+        loads_offset = BINARY_HEADER.size + 8 * matrix_size
+
+        assert os.path.getsize(file_path) == loads_offset + 8 * number_of_nodes, \
+            f"Truncated binary instance file: {file_path}"
+
+        if mmap and number_of_nodes > 0:
+            matrix = np.memmap(file_path, dtype="<f8", mode="r", offset=BINARY_HEADER.size,
+                               shape=(number_of_nodes, number_of_nodes))
+        else:
+            matrix = np.fromfile(file_path, dtype="<f8", count=matrix_size, offset=BINARY_HEADER.size)
+            matrix = matrix.reshape(number_of_nodes, number_of_nodes)
+
+        loads = np.fromfile(file_path, dtype="<f8", count=number_of_nodes, offset=loads_offset)
+
+        self.__nodes = [Node(i, load) for i, load in enumerate(loads.tolist())]
+        self.__vehicle_capacity = vehicle_capacity
+        self.__set_matrix(matrix)
+        self.__binary_path = os.path.abspath(file_path) if mmap else None
+
+    def save_binary(self, file_path: str):
+        """
+            Save this data into a **binary** file (see ``BINARY_HEADER``). For the geometric data, the distance matrix
+            is computed (see ``distance_matrix``).
+
+            :param file_path: The path of the file
+        """
+        number_of_nodes = len(self.__nodes)
+
+        with open(file_path, "wb") as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, number_of_nodes, self.__vehicle_capacity))
+            np.ascontiguousarray(self.distance_matrix, dtype="<f8").tofile(f)
+            np.array([node.load for node in self.__nodes], dtype="<f8").tofile(f)
+
+    @staticmethod
+    def generate_random(number_of_stores: int, vehicle_capacity: float = 50.,
+                        seed: Union[int, np.random.SeedSequence, np.random.Generator, None] = 12,
                         distance_mu: float = 30.,
                         distance_std: float = 10.,
                         load_mu: float = 10.,
                         load_std: float = 5.) -> Data:
         """
-            This method randomly generate a data based on given parameters.
+            This method randomly generate a data based on given parameters. The loads and the distance matrix are drawn
+            at once from a NumPy random generator: the loads and the distances are normally distributed, clipped to at
+            least one (and the loads to at most the vehicle capacity), and rounded to three decimals.
 
             :param number_of_stores: The number of stores
             :param vehicle_capacity: The vehicle load capacity
-            :param seed: Random seed
+            :param seed: Random seed, seed sequence or generator (see ``numpy.random.default_rng``)
             :param distance_mu: The mean value of traveling distance between nodes
             :param distance_std: The standard deviation value of traveling distance between nodes
             :param load_mu: The mean value of load amount for a store node
@@ -202,7 +617,8 @@ class Data:
         assert load_std > 0, "Invalid std for load amount"
 
         # Generate random object
-        rnd = Random(seed) if seed is not None else Random()
+        rng = np.random.default_rng(seed)
+        number_of_nodes = number_of_stores + 1
 
         # Generate Data object
         data = Data()
@@ -210,20 +626,241 @@ class Data:
         data.__vehicle_capacity = vehicle_capacity
 
         # Initiate nodes
-        data.__nodes = [Node(i, round(min(max(1., rnd.gauss(load_mu, load_std)), vehicle_capacity), 3) if i > 0 else 0.)
-                        for i in range(number_of_stores + 1)]
+        loads = np.clip(rng.normal(load_mu, load_std, number_of_stores), 1., vehicle_capacity).round(3)
+        data.__nodes = [Node(0)] + [Node(i, load) for i, load in enumerate(loads.tolist(), 1)]
 
         # Initiate distance matrix
-        data.__distance_matrix = {}
+        matrix = rng.normal(distance_mu, distance_std, (number_of_nodes, number_of_nodes))
+        np.maximum(matrix, 1., out=matrix)
+        matrix.round(3, out=matrix)
+        np.fill_diagonal(matrix, 0.)
+
+        data.__set_matrix(matrix)
+        data.__binary_path = None
+
+        return data
+
+    @staticmethod
+    def stream_random(number_of_stores: int, count: Optional[int] = None, seed: Optional[int] = 12,
+                      **parameters) -> Iterator[Data]:
+        """
+            This method lazily generates random data (see ``generate_random``), one instance at a time, e.g., for the
+            stress and benchmark pipelines. Each instance has its own child seed of the given seed (see
+            ``numpy.random.SeedSequence.spawn``), so the i-th instance does not depend on the count.
 
-        for i in range(number_of_stores + 1):
-            data.__distance_matrix[i] = {}
+            :param number_of_stores: The number of stores
+            :param count: The number of instances, endless if it is not defined
+            :param seed: Random seed
+            :param parameters: Other parameters of ``generate_random``
+            :return: Iterator of randomly generated **Data** objects
+        """
+        seed_sequence = np.random.SeedSequence(seed)
+        index = 0
 
-            for j in range(number_of_stores + 1):
-                if i == j:
-                    data.__distance_matrix[i][j] = 0.
-                    continue
+        while count is None or index < count:
+            yield Data.generate_random(number_of_stores, seed=seed_sequence.spawn(1)[0], **parameters)
+            index += 1
 
-                data.__distance_matrix[i][j] = round(max(1., rnd.gauss(distance_mu, distance_std)), 3)
+    @staticmethod
+    def write_random(directory: str, number_of_stores: int, count: int, seed: Optional[int] = 12,
+                     binary: bool = True, **parameters) -> List[str]:
+        """
+            This method writes random data to the given directory (see ``stream_random``), keeping a single instance
+            in memory at a time. The files are named ``random-<stores>-<seed>-<index>`` with the ``.bin`` (see
+            ``save_binary``) or ``.pkl`` extension.
+
+            :param directory: The path of the directory, which is created if it does not exist
+            :param number_of_stores: The number of stores
+            :param count: The number of instances
+            :param seed: Random seed
+            :param binary: Whether the files are binary, or pickle files
+            :param parameters: Other parameters of ``generate_random``
+            :return: Paths of the written files
+        """
+        os.makedirs(directory, exist_ok=True)
+        file_paths = []
+
+        for index, data in enumerate(Data.stream_random(number_of_stores, count, seed, **parameters)):
+            file_path = os.path.join(directory, f"random-{number_of_stores}-{seed}-{index}" +
+                                     (".bin" if binary else ".pkl"))
+
+            if binary:
+                data.save_binary(file_path)
+            else:
+                data.save(file_path)
+
+            file_paths.append(file_path)
+
+        return file_paths
+
+    @staticmethod
+    def from_coordinates(coordinates: np.ndarray, loads: Sequence[float], vehicle_capacity: float,
+                         cache_rows: Optional[int] = 1024) -> Data:
+        """
+            This method creates a geometric data, whose distances are the Euclidean distances between the coordinates
+            of the nodes. The distance matrix is not stored: each row is computed at once on its first use, and the
+            last ``cache_rows`` used rows are kept. The nearest nodes are queried from a k-d tree (see ``nearest``).
+
+            :param coordinates: (N x D) coordinates of the nodes, the first one is the depot
+            :param loads: Load amounts of the nodes, indexed by node ids (the load of the depot is ignored)
+            :param vehicle_capacity: The vehicle load capacity
+            :param cache_rows: Maximum number of cached rows, ``None`` for all rows
+            :return: Geometric **Data** object
+        """
+        assert len(loads) == len(coordinates), "Each node must have a load"
+        assert vehicle_capacity is not None and vehicle_capacity > 0, "Invalid vehicle load capacity"
+
+        data = Data()
+
+        data.__vehicle_capacity = vehicle_capacity
+        data.__nodes = [Node(i, float(load)) for i, load in enumerate(loads)]
+        data.__set_coordinates(coordinates, cache_rows)
 
         return data
+
+    @staticmethod
+    def generate_geometric(number_of_stores: int, vehicle_capacity: float = 50.,
+                           seed: Union[int, np.random.SeedSequence, np.random.Generator, None] = 12,
+                           size: float = 100.,
+                           load_mu: float = 10.,
+                           load_std: float = 5.,
+                           cache_rows: Optional[int] = 1024) -> Data:
+        """
+            This method randomly generates a geometric data (see ``from_coordinates``), where the nodes are uniformly
+            distributed in a square and the loads are drawn as in ``generate_random``.
+
+            :param number_of_stores: The number of stores
+            :param vehicle_capacity: The vehicle load capacity
+            :param seed: Random seed, seed sequence or generator (see ``numpy.random.default_rng``)
+            :param size: The side length of the square
+            :param load_mu: The mean value of load amount for a store node
+            :param load_std: The standard deviation value of load amount for a store node
+            :param cache_rows: Maximum number of cached rows, ``None`` for all rows
+            :return: Randomly generated geometric **Data** object
+        """
+        assert number_of_stores is not None and number_of_stores > 0, "Invalid number of stores"
+        assert size > 0, "Invalid square size"
+        assert load_mu > 0, "Invalid mean for load amount"
+        assert load_std > 0, "Invalid std for load amount"
+
+        rng = np.random.default_rng(seed)
+
+        loads = np.clip(rng.normal(load_mu, load_std, number_of_stores), 1., vehicle_capacity).round(3)
+        coordinates = rng.uniform(0., size, (number_of_stores + 1, 2)).round(3)
+
+        return Data.from_coordinates(coordinates, [0.] + loads.tolist(), vehicle_capacity, cache_rows)
+
+    def __build_matrix(self, distance_matrix: Dict[int, Dict[int, float]]):
+        """
+            This method builds the contiguous dense distance matrix from the dictionary-based one.
+
+            :param distance_matrix: Distance matrix as a dictionary of dictionaries, indexed by node ids
+        """
+        number_of_nodes = len(self.__nodes)
+
+        assert all(node.id == i for i, node in enumerate(self.__nodes)), "Node ids must be consecutive from zero"
+
+        matrix = np.zeros((number_of_nodes, number_of_nodes), dtype=np.float64)
+
+        for i in range(number_of_nodes):
+            row = distance_matrix[i]
+            matrix[i] = [row[j] for j in range(number_of_nodes)]
+
+        self.__set_matrix(matrix)
+        self.__binary_path = None
+
+    def __index_nodes(self):
+        """
+            This method finds the depot and the store nodes once, for the constant time lookups.
+        """
+        self.__depot_node = next((node for node in self.__nodes if node.is_depot), None)
+        self.__store_nodes = tuple(node for node in self.__nodes if node.is_store)
+        self.__store_ids = np.array([node.id for node in self.__store_nodes], dtype=np.int64)
+        self.__store_ids.flags.writeable = False
+        self.__store_mask = sum(1 << node.id for node in self.__store_nodes)
+
+    def __set_matrix(self, matrix: np.ndarray):
+        """
+            This method sets the dense distance matrix, and resets the lookups derived from it and the nodes. The rows,
+            the sorted neighbour lists and the cheapest edges are computed on their first use.
+
+            :param matrix: Dense (N x N) distance matrix
+        """
+        matrix.flags.writeable = False
+
+        self.__index_nodes()
+        self.__matrix = matrix
+        self.__coordinates = None
+        self.__tree = None
+        self.__cache_rows = None
+        self.__rows = _Rows(lambda i: matrix[i].tolist())
+        self.__neighbours = _Rows(lambda i: [j for j in np.argsort(matrix[i], kind="stable").tolist() if j != i])
+        self.__min_edges = None
+
+    def __set_coordinates(self, coordinates: np.ndarray, cache_rows: Optional[int]):
+        """
+            This method sets the coordinates of the geometric data, and resets the lookups derived from them and the
+            nodes. The rows and the sorted neighbour lists are computed from the coordinates on their first use, and
+            at most ``cache_rows`` of each are kept.
+
+            :param coordinates: (N x D) coordinates of the nodes
+            :param cache_rows: Maximum number of cached rows, ``None`` for all rows
+        """
+        coordinates = np.array(coordinates, dtype=np.float64)
+        coordinates.flags.writeable = False
+
+        assert coordinates.ndim == 2 and len(coordinates) == len(self.__nodes), "Invalid coordinates"
+        assert cache_rows is None or cache_rows >= 0, "Invalid number of cached rows"
+
+        def distances(i: int) -> np.ndarray:
+            return np.sqrt(((coordinates - coordinates[i]) ** 2).sum(axis=1))
+
+        def rows(compute: Callable[[int], List]) -> Dict[int, List]:
+            return _Rows(compute) if cache_rows is None else _LruRows(compute, cache_rows)
+
+        self.__index_nodes()
+        self.__matrix = None
+        self.__coordinates = coordinates
+        self.__tree = KDTree(coordinates)
+        self.__cache_rows = cache_rows
+        self.__rows = rows(lambda i: distances(i).tolist())
+        self.__neighbours = rows(lambda i: [j for j in np.argsort(distances(i), kind="stable").tolist() if j != i])
+        self.__min_edges = None
+        self.__binary_path = None
+
+    def __getstate__(self) -> Dict:
+        """
+            Pickling, e.g., for the worker processes. The memory-mapped data is pickled as its file path, so that the
+            workers map the same file, and the geometric data as its coordinates. The lazy lookups are not pickled.
+
+            :return: State of the data
+        """
+        if self.__binary_path is not None:
+            return {"BinaryPath": self.__binary_path}
+
+        if self.__coordinates is not None:
+            return {"Coordinates": self.__coordinates, "CacheRows": self.__cache_rows, "Nodes": self.__nodes,
+                    "VehicleCapacity": self.__vehicle_capacity}
+
+        return {"DistanceMatrix": np.asarray(self.__matrix), "Nodes": self.__nodes,
+                "VehicleCapacity": self.__vehicle_capacity}
+
+    def __setstate__(self, state: Dict):
+        """
+            Unpickling (see ``__getstate__``)
+
+            :param state: State of the data
+        """
+        if "BinaryPath" in state:
+            self.load_binary(state["BinaryPath"])
+            return
+
+        self.__nodes = state["Nodes"]
+        self.__vehicle_capacity = state["VehicleCapacity"]
+
+        if "Coordinates" in state:
+            self.__set_coordinates(state["Coordinates"], state["CacheRows"])
+            return
+
+        self.__set_matrix(np.array(state["DistanceMatrix"], dtype=np.float64))
+        self.__binary_path = None
@@ -1,5 +1,6 @@
-from typing import List
+from typing import List, Optional
 from Data import Data
+from Memo import Memo
 from Node import Node
 from Solver import Solver, Solution
 
@@ -10,17 +11,21 @@ class GreedyDFS(Solver):
         this class.
 
         >> *Note*: You are free to make changes (i.e., defining variables and methods) in this class.
+
+        The memo table can be bounded by ``memo_memory`` bytes, evicting by ``memo_policy`` (see ``Memo``).
     """
 
-    def __init__(self, data: Data):
+    def __init__(self, data: Data, memo_memory: Optional[int] = None, memo_policy: str = "lru"):
         super().__init__(data)
-        self.optimal_sol = [self.data.depot_node]
+        self.depot = self.data.depot_node
+        self.optimal_sol = [self.depot]
         self.optimal_dist = float("inf")
-        self.visited = set([self.data.depot_node])
         self.max_load = max(node.load for node in self.data.nodes if node.is_store)
         self.min_load = min(node.load for node in self.data.nodes if node.is_store)
+        self.store_mask = self.data.store_mask
+        self.depot_mask = 1 << self.depot.id
         self.iteration = 0
-        self.memo = {}
+        self.memo = Memo(memo_memory, memo_policy)
 
     def solve(self) -> Solution:
         """
@@ -30,47 +35,64 @@ class GreedyDFS(Solver):
 
             :return: Solution found by DFS
         """
-        self.dfs([self.data.depot_node],0,0)
+        if self.stats is not None:
+            self.stats.start()
+
+        self.dfs([self.depot],0,0,1 << self.depot.id)
+
+        if self.stats is not None:
+            self.stats.finish()
         print("Iterations: ", self.iteration)
         return self.optimal_sol
     
     
-    def dfs(self, track:List[Node], total_dist: float, cumulative_load: float):
+    def dfs(self, track:List[Node], total_dist: float, cumulative_load: float, mask: int):
         
         # return the first solution found
-        if self.optimal_sol != [self.data.depot_node]:
+        if self.optimal_sol != [self.depot]:
             return
+
+        stats = self.stats
         
         # Memoization check
-        nodes_set = frozenset(node.id for node in track)
-        memo_key =(nodes_set, cumulative_load)
+        memo_key = self.memo.key(mask, track[-1].id, cumulative_load)
+        if stats is not None:
+            stats.memo(memo_key in self.memo)
 
-        if memo_key in self.memo and self.memo[memo_key]<= total_dist:
+        if self.memo.prune(memo_key, total_dist, cumulative_load):
+            if stats is not None:
+                stats.prune("memo")
             return
-        self.memo[memo_key] = total_dist
  
         last_in_node = track[-1]
-        min_return_cost = min([self.data.get_distance(last_in_node, self.data.depot_node)] + [self.data.get_distance(last_in_node, n) for n in self.data.nodes if n not in self.visited])
+        unvisited = self.store_mask & ~mask
+        min_return_cost = self.data.cheapest_edge(last_in_node.id, unvisited | self.depot_mask) if unvisited or last_in_node.is_store else 0
         
         #optimizasyon: gereksiz tracklere girme
         if total_dist + min_return_cost  >= self.optimal_dist:
+            if stats is not None:
+                stats.prune("bound")
             return
         
         #initial check is all nodes are visited
-        if len(track) > 1 and last_in_node == self.data.depot_node and self.is_all_visited(track):
+        if len(track) > 1 and last_in_node.is_depot and self.is_all_visited(mask):
             if total_dist < self.optimal_dist:
                 if self.data.is_feasible(track):
                     self.optimal_sol = list(track)
                     self.optimal_dist = total_dist
+                    if stats is not None:
+                        stats.incumbent(total_dist)
             return
         
 
         self.iteration+=1 
+        if self.budget is not None:
+            self.budget.check(self.iteration)
+        if stats is not None:
+            stats.expand(len(track))
 
-        successors = sorted(
-            (node for node in self.data.nodes if node not in track or node.is_depot),
-            key=lambda node: self.data.get_distance(last_in_node, node)
-        )
+        successors = [self.data.nodes[i] for i in self.data.nearest_neighbours(last_in_node.id)
+                      if not (mask >> i) & 1 or (self.depot_mask >> i) & 1]
 
         #Expand
         for successor_node in successors:
@@ -79,33 +101,34 @@ class GreedyDFS(Solver):
                 distance = self.data.get_distance(last_in_node, successor_node)
 
                 if total_dist + distance >= self.optimal_dist:
+                  if stats is not None:
+                      stats.prune("bound")
                   continue
 
                 new_load = cumulative_load + successor_node.load
 
-                if new_load > self.data.vehicle_capacity:
+                if new_load > self.data.load_limit:
+                    if stats is not None:
+                        stats.prune("capacity")
                     continue
+
+                if stats is not None:
+                    stats.generated += 1
             
-                if successor_node.is_store and new_load <= self.data.vehicle_capacity:
+                if successor_node.is_store and new_load <= self.data.load_limit:
                     track.append(successor_node)
-                    self.dfs(track, total_dist + distance , cumulative_load + successor_node.load)
-                    self.visited.add(last_in_node)
+                    self.dfs(track, total_dist + distance , cumulative_load + successor_node.load, mask | (1 << successor_node.id))
                     track.pop()
                  
                 elif successor_node.is_depot:#and (new_load + self.max_load) > self.data.vehicle_capacity:
                     track.append(successor_node)
-                    self.dfs(track, total_dist + distance , 0)
-                    self.visited.add(last_in_node)
+                    self.dfs(track, total_dist + distance , 0, mask)
                     track.pop()
 
 
 
-    def is_all_visited (self, path: List[Node]) -> bool:
-        store_nodes = set(self.data.store_nodes)
-        for store in store_nodes:
-            if store not in path:
-                return False
-        return True
+    def is_all_visited (self, mask: int) -> bool:
+        return mask & self.store_mask == self.store_mask
 
 
 
@@ -0,0 +1,178 @@
+from typing import List
+import numpy as np
+from Data import Data
+from Node import Node
+from Solver import Solver, Solution
+
+
+class HeldKarp(Solver):
+    """
+    This is the dynamic programming class based on Held-Karp algorithm.
+
+    A route is a sequence of trips, each of which starts and ends at the depot and carries at most the vehicle
+    capacity. Firstly, the cheapest trip for every subset of stores is found by the Held-Karp recursion over
+    (visited mask, last store), vectorized over all the masks having the same number of stores. The masks exceeding the
+    vehicle capacity (i.e., ``Data.load_limit``) are never expanded. Then, the stores are partitioned into trips by a
+    subset DP, where each mask is completed by a trip containing its lowest store. The trips of all the masks having
+    the same lowest store and size are enumerated at once, as the subsets of their higher stores up to the largest
+    feasible trip size.
+
+    The trips take O(2^N * N^2) time, and the partition takes O(3^N) time in the worst case (i.e., when every subset
+    of stores fits into the vehicle) and less with a tighter capacity. It takes O(2^N * N) memory for N stores, so its
+    running time is predictable and does not depend on the pruning of the tree-search algorithms.
+    """
+    exact = True
+
+    def __init__(self, data: Data):
+        super().__init__(data)
+        self.optimal_sol = [self.data.depot_node]
+        self.optimal_dist = float("inf")
+        self.stores = list(self.data.store_nodes)
+        self.iteration = 0
+
+    def solve(self) -> Solution:
+        if self.stats is not None:
+            self.stats.start()
+
+        number_of_stores = len(self.stores)
+        size = 1 << number_of_stores
+
+        ids = [node.id for node in self.stores]
+        depot_id = self.data.depot_node.id
+        distances = self.data.distance_matrix
+        store_distances = distances[np.ix_(ids, ids)]
+        loads = np.array([node.load for node in self.stores], dtype=np.float64)
+
+        # Stores of each mask
+        masks = np.arange(size, dtype=np.int64)
+        bits = ((masks[:, None] >> np.arange(number_of_stores)) & 1).astype(bool)
+        mask_loads = bits.astype(np.float64) @ loads
+        feasible = mask_loads <= self.data.load_limit
+        sizes = bits.sum(axis=1)
+
+        # Held-Karp: paths[mask, j] is the cheapest path from the depot visiting the stores in mask and ending at j
+        paths = np.full((size, number_of_stores), np.inf)
+        parents = np.full((size, number_of_stores), -1, dtype=np.int16)
+
+        for j in range(number_of_stores):
+            if feasible[1 << j]:
+                paths[1 << j, j] = distances[depot_id, ids[j]]
+
+        for k in range(2, number_of_stores + 1):
+            layer = masks[(sizes == k) & feasible]
+
+            if len(layer) == 0:
+                break
+
+            if self.budget is not None:
+                self.budget.check(self.iteration)
+
+            for j in range(number_of_stores):
+                targets = layer[bits[layer, j]]
+                candidates = paths[targets ^ (1 << j)] + store_distances[:, j]
+                best = np.argmin(candidates, axis=1)
+
+                paths[targets, j] = candidates[np.arange(len(targets)), best]
+                parents[targets, j] = best
+
+        # The cheapest trip for each mask
+        returns = paths + distances[ids, depot_id]
+        trip_ends = np.argmin(returns, axis=1)
+        trip_costs = returns[masks, trip_ends]
+
+        # Subset DP: covers[mask] is the cheapest cover of the mask by trips, where the trip chosen[mask] contains the
+        # lowest store of the mask. The rest of the mask only has higher stores, so the masks are covered from the
+        # highest lowest store down, and the masks having the same lowest store and size are covered at once.
+        covers = np.full(size, np.inf)
+        covers[0] = 0.
+        chosen = np.zeros(size, dtype=np.int64)
+        lowest = masks & -masks
+        trip_sizes = sizes[np.isfinite(trip_costs)]
+        max_trip_size = int(trip_sizes.max()) if len(trip_sizes) else 0
+
+        for j in reversed(range(number_of_stores)):
+            for k in range(1, number_of_stores - j + 1):
+                group = masks[(lowest == 1 << j) & (sizes == k)]
+
+                # The trips of a mask are its lowest store with the subsets of its higher stores, which are enumerated
+                # in ascending order up to the largest trip size (so the ties are broken as by the lowest trip)
+                keep = np.flatnonzero(sizes[:1 << (k - 1)] < max_trip_size)
+
+                if len(group) == 0 or len(keep) == 0:
+                    continue
+
+                positions = np.nonzero(bits[group, j + 1:])[1].reshape(len(group), k - 1) + j + 1
+                chunk_size = max(1, (1 << 22) >> (k - 1))
+
+                for start in range(0, len(group), chunk_size):
+                    targets = group[start:start + chunk_size]
+                    subsets = np.zeros((len(targets), 1), dtype=np.int64)
+
+                    for b in range(k - 1):
+                        subsets = np.concatenate([subsets, subsets | (1 << positions[start:start + chunk_size, b:b + 1])],
+                                                 axis=1)
+
+                    candidates = subsets[:, keep] | (1 << j)
+                    values = covers[targets[:, None] ^ candidates] + trip_costs[candidates]
+                    best = np.argmin(values, axis=1)
+                    rows = np.arange(len(targets))
+
+                    covers[targets] = values[rows, best]
+                    chosen[targets] = candidates[rows, best]
+                    covered = int(np.isfinite(covers[targets]).sum())
+                    self.iteration += covered
+
+                    if self.budget is not None:
+                        self.budget.check(self.iteration)
+
+                    if self.stats is not None:
+                        self.stats.generated += int(np.isfinite(trip_costs[candidates]).sum())
+                        self.stats.expansions += covered
+
+        if not np.isfinite(covers[size - 1]):
+            if self.stats is not None:
+                self.stats.finish()
+            print("Iterations:", self.iteration)
+            return self.optimal_sol
+
+        # Reconstruct the route
+        solution = [self.data.depot_node]
+        mask = size - 1
+
+        while mask:
+            trip = int(chosen[mask])
+            solution += self.reconstruct_trip(trip, int(trip_ends[trip]), parents) + [self.data.depot_node]
+            mask ^= trip
+
+        # The subset sums of the loads are checked against the same limit as ``Data.is_feasible``, so the route should
+        # be feasible, otherwise it is rejected and the solver is not exact for this data
+        if not self.data.is_feasible(solution):
+            print("Held-Karp route is not feasible, it is rejected")
+            self.exact = False
+
+            if self.stats is not None:
+                self.stats.finish()
+            print("Iterations:", self.iteration)
+            return self.optimal_sol
+
+        self.optimal_sol = solution
+        self.optimal_dist = self.data.calculate_objective(solution)
+
+        if self.stats is not None:
+            self.stats.incumbent(self.optimal_dist)
+            self.stats.finish()
+        print("Iterations:", self.iteration)
+        return self.optimal_sol
+
+    def reconstruct_trip(self, trip: int, last: int, parents: np.ndarray) -> List[Node]:
+        track = []
+
+        while trip:
+            track.append(self.stores[last])
+            previous = int(parents[trip, last])
+            trip ^= 1 << last
+            last = previous
+
+        track.reverse()
+
+        return track
@@ -0,0 +1,401 @@
+import math
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Type, Union
+import numpy as np
+from Data import Data
+from Node import Node
+from PriorityQueue import PriorityQueue
+
+
+class Heuristic(ABC):
+    """
+        This *abstract* class estimates the remaining cost of a search state, i.e., the distance from the current node
+        through all the unvisited stores back to the depot. Sets of stores are given as bitmasks (see ``State``).
+
+        The parts depending only on the set of unvisited stores are memoized in an LRU cache with ``cache_size``
+        entries, so the same subset is not computed again across the expansions.
+
+        ``batch`` estimates many states at once, e.g., a level of ``BeamSearch``. The subclasses compute the whole batch
+        with NumPy, and give the same estimations as the single states.
+    """
+    data: Data                  #: Target problem data
+    cache_size: Optional[int]   #: Maximum number of memoized subsets, ``None`` for no limit
+    admissible: bool = True     #: Whether the estimation never exceeds the remaining cost, or not
+
+    def __init__(self, data: Data, cache_size: Optional[int] = 1 << 18):
+        """
+            Constructor
+
+            :param data: Target problem data
+            :param cache_size: Maximum number of memoized subsets, ``None`` for no limit
+        """
+        self.data = data
+        self.cache_size = cache_size
+        self.depot_id = data.depot_node.id
+        self.loads = [node.load for node in data.nodes]
+
+    @abstractmethod
+    def __call__(self, node: Node, unvisited: int, load: float = 0.) -> float:
+        """
+            This method estimates the remaining cost.
+
+            :param node: Current node
+            :param unvisited: Bitmask of the unvisited stores
+            :param load: Cumulative load of the current trip
+            :return: Estimated remaining cost
+        """
+        ...
+
+    def batch(self, node_ids: np.ndarray, unvisited: np.ndarray, loads: np.ndarray) -> np.ndarray:
+        """
+            This method estimates the remaining costs of many states at once. This one calls the heuristic for each
+            state, the subclasses compute the whole batch with NumPy.
+
+            :param node_ids: (B) ids of the current nodes
+            :param unvisited: (B x N) whether each store is unvisited, indexed by node ids
+            :param loads: (B) cumulative loads of the current trips
+            :return: (B) estimated remaining costs
+        """
+        nodes = self.data.nodes
+        masks = [sum(1 << i for i in np.flatnonzero(row).tolist()) for row in unvisited]
+
+        return np.array([self(nodes[node_id], mask, load)
+                         for node_id, mask, load in zip(node_ids.tolist(), masks, loads.tolist())], dtype=np.float64)
+
+    def rows(self, ids: np.ndarray, targets: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+            This method provides the rows of the distance matrix for the given node ids. For the geometric data, each
+            distinct row is computed from the coordinates once.
+
+            :param ids: Source node ids
+            :param targets: Optional target node ids, all the nodes by default
+            :return: (len(ids) x N) distances from the source nodes, or (len(ids) x len(targets)) with ``targets``
+        """
+        coordinates = self.data.coordinates
+
+        if coordinates is None:
+            matrix = self.data.distance_matrix
+
+            return matrix[ids] if targets is None else matrix[np.ix_(ids, targets)]
+
+        target_coordinates = coordinates if targets is None else coordinates[targets]
+        ids, inverse = np.unique(ids, return_inverse=True)
+
+        return np.sqrt(((coordinates[ids][:, None] - target_coordinates[None]) ** 2).sum(axis=2))[inverse]
+
+    def cheapest_edges(self, node_ids: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """
+            This method provides the cheapest edge from each given node to another node in its targets (see
+            ``Data.cheapest_edge``).
+
+            :param node_ids: (B) ids of the source nodes
+            :param targets: (B x N) whether each node is a target, indexed by node ids
+            :return: (B) distances of the cheapest edges, ``inf`` without a target
+        """
+        targets = targets.copy()
+        targets[np.arange(len(node_ids)), node_ids] = False
+
+        return np.where(targets, self.rows(node_ids), np.inf).min(axis=1, initial=np.inf)
+
+    def with_returns(self, estimates: np.ndarray, node_ids: np.ndarray, unvisited: np.ndarray) -> np.ndarray:
+        """
+            This method replaces the estimations of the states without unvisited stores by their returns to the depot.
+
+            :param estimates: (B) estimated remaining costs
+            :param node_ids: (B) ids of the current nodes
+            :param unvisited: (B x N) whether each store is unvisited, indexed by node ids
+            :return: (B) estimated remaining costs
+        """
+        complete = ~unvisited.any(axis=1)
+
+        if complete.any():
+            estimates[complete] = self.rows(node_ids[complete])[:, self.depot_id]
+
+        return estimates
+
+    def memoize(self, function: Callable) -> Callable:
+        """
+            This method wraps the given function with the LRU cache of this heuristic.
+
+            :param function: Function to memoize
+            :return: Memoized function
+        """
+        return lru_cache(maxsize=self.cache_size)(function)
+
+    @staticmethod
+    def ids_of(mask: int) -> List[int]:
+        """
+            This method provides the node ids in the given bitmask.
+
+            :param mask: Bitmask of nodes
+            :return: List of node ids
+        """
+        ids = []
+
+        while mask:
+            low = mask & -mask
+            ids.append(low.bit_length() - 1)
+            mask ^= low
+
+        return ids
+
+
+class ShortestPathHeuristic(Heuristic):
+    """
+        This heuristic approach uses the Dijkstra shortest path algorithm to find shortest path between unvisited nodes.
+        The sum of the shortest path distances from the current node to each unvisited store is the estimation.
+
+        **Note**: This heuristic is not admissible, since a path may be counted for several stores.
+    """
+    admissible = False
+
+    def __init__(self, data: Data, cache_size: Optional[int] = 1 << 18):
+        super().__init__(data, cache_size)
+        self.shortest_paths = self.memoize(self.shortest_paths)
+
+    def __call__(self, node: Node, unvisited: int, load: float = 0.) -> float:
+        return self.shortest_paths(node.id, unvisited)
+
+    def shortest_paths(self, node_id: int, unvisited: int) -> float:
+        ids = self.ids_of(unvisited | (1 << node_id))
+        costs = {i: float("inf") for i in ids}
+        costs[node_id] = 0.
+
+        priority_queue = PriorityQueue()
+        priority_queue.enqueue(node_id, 0., node_id)
+
+        while not priority_queue.is_empty():
+            source = priority_queue.dequeue()
+
+            for target in ids:
+                cost = costs[source] + self.data.distance(source, target)
+
+                if cost < costs[target]:
+                    costs[target] = cost
+                    priority_queue.decrease_key(target, cost, target)
+
+        return sum(costs.values())
+
+
+class MinimumSpanningTreeHeuristic(Heuristic):
+    """
+        This heuristic approach uses Prim's algorithm to calculate minimum spanning tree between unvisited nodes.
+
+        The remaining route leaves the current node once, and then connects all the unvisited stores and the depot.
+        Thus, the cheapest edge from the current node plus the minimum spanning tree of the unvisited stores and the
+        depot (over the cheaper direction of each edge) is admissible.
+
+        Prim's algorithm runs on the dense distance submatrix with NumPy, i.e., O(k^2) vectorized work for k unvisited
+        stores. In ``batch``, it grows the trees of all the states at once. The Euclidean distances of the geometric
+        data are already symmetric, so their submatrices are computed from the coordinates without the whole matrix.
+    """
+    def __init__(self, data: Data, cache_size: Optional[int] = 1 << 18):
+        super().__init__(data, cache_size)
+        self.symmetric_matrix = np.minimum(data.distance_matrix, data.distance_matrix.T) \
+            if data.coordinates is None else None
+        self.spanning_tree = self.memoize(self.spanning_tree)
+
+    def __call__(self, node: Node, unvisited: int, load: float = 0.) -> float:
+        if not unvisited:
+            return self.data.distance(node.id, self.depot_id)
+
+        return self.data.cheapest_edge(node.id, unvisited | (1 << self.depot_id)) + self.spanning_tree(unvisited)
+
+    def spanning_tree(self, unvisited: int) -> float:
+        ids = self.ids_of(unvisited | (1 << self.depot_id))
+        matrix = self.symmetric_matrix[np.ix_(ids, ids)] if self.symmetric_matrix is not None else self.rows(ids, ids)
+
+        # Prim's algorithm starting from the first node
+        costs = matrix[0].copy()
+        in_tree = np.zeros(len(ids), dtype=bool)
+        in_tree[0] = True
+        costs[0] = np.inf
+        total_cost = 0.
+
+        for _ in range(len(ids) - 1):
+            closest = int(np.argmin(costs))
+            total_cost += costs[closest]
+            in_tree[closest] = True
+
+            np.minimum(costs, matrix[closest], out=costs)
+            costs[in_tree] = np.inf
+
+        return float(total_cost)
+
+    def batch(self, node_ids: np.ndarray, unvisited: np.ndarray, loads: np.ndarray) -> np.ndarray:
+        targets = unvisited.copy()
+        targets[:, self.depot_id] = True
+
+        return self.with_returns(self.cheapest_edges(node_ids, targets) + self.spanning_trees(targets), node_ids,
+                                 unvisited)
+
+    def spanning_trees(self, active: np.ndarray) -> np.ndarray:
+        """
+            This method provides the costs of the minimum spanning trees of many node sets by Prim's algorithm, which
+            grows all the trees at once. As in ``spanning_tree``, each tree starts from its lowest node id, so the
+            costs are the same.
+
+            :param active: (B x N) whether each node is in the set, indexed by node ids
+            :return: (B) costs of the minimum spanning trees
+        """
+        batch = np.arange(len(active))
+        first = np.argmax(active, axis=1)
+        remaining = active.sum(axis=1) - 1  # Number of the edges left in each tree
+
+        in_tree = ~active
+        in_tree[batch, first] = True
+        costs = self.symmetric_rows(first)
+        costs[in_tree] = np.inf
+        total_costs = np.zeros(len(active))
+
+        for _ in range(int(remaining.max(initial=0))):
+            closest = np.argmin(costs, axis=1)
+            growing = remaining > 0
+            total_costs[growing] += costs[batch, closest][growing]
+            remaining -= growing
+            in_tree[batch, closest] |= growing
+
+            np.minimum(costs, self.symmetric_rows(closest), out=costs)
+            costs[in_tree] = np.inf
+
+        return total_costs
+
+    def symmetric_rows(self, ids: np.ndarray) -> np.ndarray:
+        """
+            This method provides the rows of the symmetric distance matrix for the given node ids.
+
+            :param ids: Source node ids
+            :return: (len(ids) x N) cheaper distances of both directions
+        """
+        return self.symmetric_matrix[ids] if self.symmetric_matrix is not None else self.rows(ids)
+
+
+class NearestNeighbourHeuristic(Heuristic):
+    """
+        Each unvisited store must be left exactly once towards another unvisited store or the depot, and the current
+        node must be left once. Thus, the sum of these cheapest outgoing edges is admissible.
+    """
+    def __init__(self, data: Data, cache_size: Optional[int] = 1 << 18):
+        super().__init__(data, cache_size)
+        self.outgoing_edges = self.memoize(self.outgoing_edges)
+
+    def __call__(self, node: Node, unvisited: int, load: float = 0.) -> float:
+        if not unvisited:
+            return self.data.distance(node.id, self.depot_id)
+
+        return self.data.cheapest_edge(node.id, unvisited | (1 << self.depot_id)) + self.outgoing_edges(unvisited)
+
+    def outgoing_edges(self, unvisited: int) -> float:
+        targets = unvisited | (1 << self.depot_id)
+
+        return sum(self.data.cheapest_edge(i, targets) for i in self.ids_of(unvisited))
+
+    def batch(self, node_ids: np.ndarray, unvisited: np.ndarray, loads: np.ndarray) -> np.ndarray:
+        targets = unvisited.copy()
+        targets[:, self.depot_id] = True
+        outgoing_edges = np.zeros(len(node_ids))
+
+        # In the order of the node ids, so that the sums are the same as in outgoing_edges
+        for i in np.flatnonzero(unvisited.any(axis=0)).tolist():
+            edges = self.cheapest_edges(np.full(len(node_ids), i), targets)
+            outgoing_edges += np.where(unvisited[:, i], edges, 0.)
+
+        return self.with_returns(self.cheapest_edges(node_ids, targets) + outgoing_edges, node_ids, unvisited)
+
+
+class TripCountHeuristic(Heuristic):
+    """
+        The remaining load that does not fit into the current trip requires new trips. Each new trip leaves the depot
+        towards an unvisited store, and comes back from an unvisited store. Thus, the number of new trips times the
+        cheapest departure and return edges is admissible.
+    """
+    def __init__(self, data: Data, cache_size: Optional[int] = 1 << 18):
+        super().__init__(data, cache_size)
+        self.trip_edges = self.memoize(self.trip_edges)
+
+    def __call__(self, node: Node, unvisited: int, load: float = 0.) -> float:
+        if not unvisited:
+            return self.data.distance(node.id, self.depot_id)
+
+        remaining_load, trip_cost = self.trip_edges(unvisited)
+        capacity = self.data.load_limit
+        trips = max(0, math.ceil((remaining_load - (capacity - load)) / capacity - 1e-9))
+
+        return trips * trip_cost
+
+    def trip_edges(self, unvisited: int) -> tuple:
+        ids = self.ids_of(unvisited)
+
+        departure = min(self.data.distance(self.depot_id, i) for i in ids)
+        arrival = min(self.data.distance(i, self.depot_id) for i in ids)
+
+        return sum(self.loads[i] for i in ids), departure + arrival
+
+    def batch(self, node_ids: np.ndarray, unvisited: np.ndarray, loads: np.ndarray) -> np.ndarray:
+        remaining_loads = np.zeros(len(node_ids))
+
+        # In the order of the node ids, so that the sums are the same as in trip_edges
+        for i in np.flatnonzero(unvisited.any(axis=0)).tolist():
+            remaining_loads += np.where(unvisited[:, i], self.loads[i], 0.)
+
+        departures = self.rows(np.array([self.depot_id]))[0]
+        arrivals = departures if self.data.coordinates is not None else self.data.distance_matrix[:, self.depot_id]
+        trip_costs = np.where(unvisited, departures, np.inf).min(axis=1, initial=np.inf) \
+            + np.where(unvisited, arrivals, np.inf).min(axis=1, initial=np.inf)
+
+        capacity = self.data.load_limit
+        trips = np.maximum(0, np.ceil((remaining_loads - (capacity - loads)) / capacity - 1e-9))
+
+        return self.with_returns(trips * np.where(trips > 0, trip_costs, 0.), node_ids, unvisited)
+
+
+class MaxHeuristic(Heuristic):
+    """
+        The maximum of several admissible heuristics is also admissible.
+    """
+    def __init__(self, data: Data, heuristics: List[Heuristic]):
+        super().__init__(data, None)
+        self.heuristics = heuristics
+        self.admissible = all(heuristic.admissible for heuristic in heuristics)
+
+    def __call__(self, node: Node, unvisited: int, load: float = 0.) -> float:
+        return max(heuristic(node, unvisited, load) for heuristic in self.heuristics)
+
+    def batch(self, node_ids: np.ndarray, unvisited: np.ndarray, loads: np.ndarray) -> np.ndarray:
+        return np.max([heuristic.batch(node_ids, unvisited, loads) for heuristic in self.heuristics], axis=0)
+
+
+HEURISTICS: Dict[str, Type[Heuristic]] = {
+    "shortest_path": ShortestPathHeuristic,
+    "mst": MinimumSpanningTreeHeuristic,
+    "nearest_neighbour": NearestNeighbourHeuristic,
+    "trip_count": TripCountHeuristic,
+}
+"""
+    Selectable heuristics by their names.
+"""
+
+
+def make_heuristic(heuristic: Union[str, Heuristic], data: Data, cache_size: Optional[int] = 1 << 18) -> Heuristic:
+    """
+        This function provides the heuristic with the given name. Several names can be combined with ``+``, such as
+        ``"mst+trip_count"``, which takes the maximum of them.
+
+        :param heuristic: Name of the heuristic, or a *Heuristic* object.
+        :param data: Target problem data
+        :param cache_size: Maximum number of memoized subsets, ``None`` for no limit
+        :return: *Heuristic* object
+    """
+    if isinstance(heuristic, Heuristic):
+        return heuristic
+
+    names = heuristic.split("+")
+
+    for name in names:
+        assert name in HEURISTICS, f"Unknown heuristic: {name}"
+
+    if len(names) == 1:
+        return HEURISTICS[heuristic](data, cache_size)
+
+    return MaxHeuristic(data, [HEURISTICS[name](data, cache_size) for name in names])
@@ -0,0 +1,144 @@
+from typing import List, Optional, Sequence, Union
+from Data import Data
+from Heuristic import Heuristic, make_heuristic
+from Memo import Memo
+from Node import Node
+from Solver import Solver, Solution
+
+
+class IDAStar(Solver):
+    """
+    This is the iterative-deepening A* (IDA*) class.
+
+    Each iteration is a depth-first search on an in-place track (as in ``DFS.dfs``), which prunes the states having
+    f(n) = g(n) + h(n) over the threshold. The first threshold is h(n) of the root, and the next one is the lowest f(n)
+    over the threshold in the previous iteration, so the memory is linear in the depth of the search. Since the
+    distances are real numbers, the threshold grows by at least ``growth`` times in each iteration. The search also
+    prunes against the incumbent, so the incumbent is optimal once an iteration finishes with a threshold not lower
+    than its objective.
+
+    h(n) is provided by the given heuristic (see ``Heuristic.HEURISTICS``), which must be admissible for an optimal
+    solution. An optional transposition table of ``table_memory`` bytes (see ``Memo``) prunes the dominated states
+    within an iteration; it is disabled with ``0``.
+    """
+    def __init__(self, data: Data, heuristic: Union[str, Heuristic] = "mst+trip_count", growth: float = 0.01,
+                 table_memory: int = 1 << 24, initial_solution: Optional[Union[Solution, Sequence[int]]] = None):
+        super().__init__(data)
+        self.heuristic = make_heuristic(heuristic, self.data)
+        self.exact = self.heuristic.admissible
+        self.growth = growth
+        self.table_memory = table_memory
+        self.optimal_sol = [self.data.depot_node]
+        self.optimal_dist = float("inf")
+        self.store_mask = self.data.store_mask
+        self.depot_mask = 1 << self.data.depot_node.id
+        self.iteration = 0
+        self.threshold = 0.
+        self.next_threshold = float("inf")
+        self.proven_bound = 0.
+        self.memo = None
+
+        if initial_solution is not None:
+            self.warm_start(initial_solution)
+
+    def solve(self) -> Solution:
+        if self.stats is not None:
+            self.stats.start()
+
+        depot = self.data.depot_node
+        self.threshold = self.heuristic(depot, self.store_mask, 0.)
+        self.proven_bound = self.threshold
+
+        while self.threshold < self.optimal_dist:
+            self.next_threshold = float("inf")
+            self.memo = Memo(self.table_memory) if self.table_memory else None
+
+            self.search([depot], 0., 0., self.depot_mask)
+
+            # The pass is complete, so every cheaper route than the lowest pruned f(n) or the incumbent is searched
+            self.proven_bound = max(self.proven_bound, self.next_threshold)
+
+            if self.next_threshold == float("inf"):
+                break
+
+            self.threshold = max(self.next_threshold, self.threshold * (1 + self.growth))
+
+        if self.stats is not None:
+            self.stats.finish()
+        print("Iterations:", self.iteration)
+        return self.optimal_sol
+
+    def search(self, track: List[Node], total_dist: float, cumulative_load: float, mask: int):
+        stats = self.stats
+        node = track[-1]
+        unvisited = self.store_mask & ~mask
+
+        if stats is None:
+            fn = total_dist + self.heuristic(node, unvisited, cumulative_load)
+        else:
+            fn = total_dist + stats.heuristic(self.heuristic, node, unvisited, cumulative_load)
+
+        if fn > self.threshold or fn >= self.optimal_dist:
+            if fn < self.optimal_dist:
+                self.next_threshold = min(self.next_threshold, fn)
+            if stats is not None:
+                stats.prune("bound")
+            return
+
+        if not unvisited and node.is_depot:
+            if total_dist < self.optimal_dist and self.data.is_feasible(track):
+                self.optimal_sol = list(track)
+                self.optimal_dist = total_dist
+                if stats is not None:
+                    stats.incumbent(total_dist)
+            return
+
+        # Transposition table: a dominating state has been searched with the same threshold
+        if self.memo is not None:
+            memo_key = self.memo.key(mask, node.id, cumulative_load)
+            if stats is not None:
+                stats.memo(memo_key in self.memo)
+
+            if self.memo.prune(memo_key, total_dist, cumulative_load):
+                if stats is not None:
+                    stats.prune("memo")
+                return
+
+        self.iteration += 1
+        if self.budget is not None:
+            self.budget.check(self.iteration)
+        if stats is not None:
+            stats.expand(len(track))
+
+        for successor_id in self.data.nearest_neighbours(node.id):
+            successor = self.data.nodes[successor_id]
+
+            if successor.is_depot:
+                if node.is_depot:
+                    continue
+
+                new_load = 0.
+            elif (mask >> successor_id) & 1:
+                continue
+            else:
+                new_load = cumulative_load + successor.load
+
+                if new_load > self.data.load_limit:
+                    if stats is not None:
+                        stats.prune("capacity")
+                    continue
+
+            if stats is not None:
+                stats.generated += 1
+
+            track.append(successor)
+            self.search(track, total_dist + self.data.distance(node.id, successor_id), new_load,
+                        mask | (1 << successor_id))
+            track.pop()
+
+    def lower_bound(self) -> float:
+        # Only the completed passes prove a bound, the threshold of the current pass may be over the optimum
+        if not self.exact:
+            return super().lower_bound()
+
+        return max(super().lower_bound(), min(self.proven_bound, self.optimal_dist))
@@ -0,0 +1,126 @@
+import heapq
+from typing import List, Tuple
+import numpy as np
+
+
+class KDTree:
+    """
+        This class is a k-d tree over the coordinates of the nodes, for the k-nearest neighbour queries by the Euclidean
+        distance without the distance matrix.
+
+        The tree is built in O(N log N) time for N points: each internal node splits its points at the median of the
+        dimension having the largest spread, until at most ``leaf_size`` points are left. A query visits the nearer
+        child first, and visits the farther one only if the splitting plane is closer than the k-th nearest point so
+        far. The distances of the points in a leaf are computed at once. The ties are broken by the point indices.
+    """
+    points: np.ndarray      #: (N x D) coordinates of the points
+    leaf_size: int          #: Maximum number of points in a leaf
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 16):
+        """
+            Constructor
+
+            :param points: (N x D) coordinates of the points
+            :param leaf_size: Maximum number of points in a leaf
+        """
+        assert leaf_size > 0, "Invalid leaf size"
+
+        self.points = np.asarray(points, dtype=np.float64)
+        self.leaf_size = leaf_size
+
+        # The point indices in the tree order, each tree node holds a range of it
+        self.__order = np.arange(len(self.points))
+        self.__ranges: List[Tuple[int, int]] = []
+        self.__splits: List[Tuple[int, float]] = []     # (Dimension, value) of each internal node, (-1, 0.) for leaves
+        self.__children: List[Tuple[int, int]] = []     # (Left, right) of each internal node
+
+        if len(self.points):
+            self.__build(0, len(self.points))
+
+    def __build(self, start: int, end: int) -> int:
+        """
+            This method builds the sub-tree of the points ``order[start:end]``.
+
+            :param start: Start of the range
+            :param end: End of the range
+            :return: Index of the sub-tree root
+        """
+        index = len(self.__ranges)
+        self.__ranges.append((start, end))
+        self.__splits.append((-1, 0.))
+        self.__children.append((-1, -1))
+
+        if end - start <= self.leaf_size:
+            return index
+
+        indices = self.__order[start:end]
+        points = self.points[indices]
+        dimension = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+        middle = (end - start) // 2
+
+        # The median is at the middle, the points before (after) it are not greater (less) than it
+        partition = np.argpartition(points[:, dimension], middle)
+        self.__order[start:end] = indices[partition]
+
+        self.__splits[index] = (dimension, float(self.points[self.__order[start + middle], dimension]))
+        self.__children[index] = (self.__build(start, start + middle), self.__build(start + middle, end))
+
+        return index
+
+    def query(self, point: np.ndarray, k: int) -> Tuple[List[float], List[int]]:
+        """
+            This method provides the k nearest points to the given point.
+
+            :param point: Coordinates of the query point
+            :param k: Number of the nearest points
+            :return: Distances and indices of the nearest points, nearest first
+        """
+        point = np.asarray(point, dtype=np.float64)
+        k = min(k, len(self.points))
+        heap = []  # Max-heap of the (negative squared distance, negative index) pairs of the k nearest points so far
+
+        if k <= 0:
+            return [], []
+
+        stack = [(0, 0.)]  # Sub-trees with the squared distances of their splitting planes
+
+        while stack:
+            index, bound = stack.pop()
+
+            if len(heap) == k and bound > -heap[0][0]:
+                continue
+
+            dimension, value = self.__splits[index]
+
+            if dimension < 0:
+                start, end = self.__ranges[index]
+                indices = self.__order[start:end]
+                squared = ((self.points[indices] - point) ** 2).sum(axis=1)
+
+                for distance, i in zip(squared.tolist(), indices.tolist()):
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-distance, -i))
+                    elif (-distance, -i) > heap[0]:
+                        heapq.heapreplace(heap, (-distance, -i))
+
+                continue
+
+            difference = float(point[dimension]) - value
+            left, right = self.__children[index]
+            near, far = (left, right) if difference < 0 else (right, left)
+
+            # The farther child is pushed first, and checked again when it is popped
+            stack.append((far, max(bound, difference * difference)))
+            stack.append((near, bound))
+
+        nearest = sorted((-distance, -i) for distance, i in heap)
+
+        return [float(np.sqrt(distance)) for distance, _ in nearest], [i for _, i in nearest]
+
+    def __len__(self) -> int:
+        """
+            This method provides the number of points.
+
+            :return: Number of points
+        """
+        return len(self.points)
@@ -0,0 +1,196 @@
+from typing import Dict, List, Tuple
+from Data import Data, Solution
+
+
+class LocalSearch:
+    """
+        This class improves a feasible solution of any solver by local search, until no improving move is left (i.e.,
+        a local optimum). The route is split into trips at the depot visits, and three moves are applied:
+
+        - **2-opt** reverses a segment of a trip.
+        - **Relocate** moves a store to another position, in the same trip or in another trip.
+        - **Or-opt** moves a segment of two to ``max_segment`` stores in the same way, keeping its direction.
+
+        Each move is evaluated by its delta in constant time, i.e., only the changed edges are summed. Since the
+        distances may be asymmetric, the cost of a reversed segment is taken from the prefix sums of the backward edges
+        of the trip. The candidate moves are restricted to the ``neighbours`` nearest nodes (see
+        ``Data.nearest``), and the moves between the trips must fit into the vehicle capacity.
+    """
+    data: Data          #: Target problem data
+    neighbours: int     #: Number of the nearest nodes considered for each move
+    max_segment: int    #: Maximum length of the segments moved by or-opt
+    moves: int          #: Number of the applied moves
+
+    def __init__(self, data: Data, neighbours: int = 8, max_segment: int = 3):
+        """
+            Constructor
+
+            :param data: Target problem data
+            :param neighbours: Number of the nearest nodes considered for each move
+            :param max_segment: Maximum length of the segments moved by or-opt
+        """
+        self.data = data
+        self.neighbours = neighbours
+        self.max_segment = max_segment
+        self.moves = 0
+        self.depot_id = data.depot_node.id
+        self.loads = [node.load for node in data.nodes]
+        self.candidates = [data.nearest(node.id, neighbours) for node in data.nodes]
+
+    def improve(self, solution: Solution) -> Solution:
+        """
+            This method improves the given solution.
+
+            :param solution: Feasible solution
+            :return: Improved solution, which is also feasible, or the given solution if no feasible improvement
+        """
+        assert self.data.is_feasible(solution), "Local search requires a feasible solution"
+
+        trips = self.split(solution)
+        loads = [sum(self.loads[store] for store in trip) for trip in trips]
+
+        while self.two_opt(trips) or self.move_segment(trips, loads, 1) or \
+                any(self.move_segment(trips, loads, length) for length in range(2, self.max_segment + 1)):
+            self.moves += 1
+
+        improved = self.join(trips)
+
+        # The loads of the trips are updated by the moves, so the route is checked as in ``Data.is_feasible`` (e.g.,
+        # for the rounding of the sums), otherwise the given solution is kept
+        if not self.data.is_feasible(improved) or \
+                self.data.calculate_objective(improved) > self.data.calculate_objective(solution) + 1e-9:
+            return solution
+
+        return improved
+
+    def split(self, solution: Solution) -> List[List[int]]:
+        # Store ids of each trip, the empty trips (i.e., consecutive depot visits) are dropped
+        trips = [[]]
+
+        for node in solution[1:]:
+            if node.is_depot:
+                trips.append([])
+            else:
+                trips[-1].append(node.id)
+
+        return [trip for trip in trips if trip]
+
+    def join(self, trips: List[List[int]]) -> Solution:
+        nodes = self.data.nodes
+        solution = [self.data.depot_node]
+
+        for trip in trips:
+            solution += [nodes[i] for i in trip] + [self.data.depot_node]
+
+        return solution
+
+    def positions(self, trips: List[List[int]]) -> Dict[int, Tuple[int, int]]:
+        # (Trip, index) of each store, where the index is in the trip path starting at the depot
+        return {store: (t, i + 1) for t, trip in enumerate(trips) for i, store in enumerate(trip)}
+
+    def two_opt(self, trips: List[List[int]]) -> bool:
+        """
+            This method applies the first improving 2-opt move, i.e., the reversal of ``path[i..j]`` in a trip, which
+            replaces the edges ``(path[i - 1], path[i])`` and ``(path[j], path[j + 1])`` by ``(path[i - 1], path[j])``
+            and ``(path[i], path[j + 1])``. The new edge from ``path[i - 1]`` goes to one of its nearest nodes.
+
+            :param trips: Store ids of each trip, which are updated in place
+            :return: Whether a move has been applied, or not.
+        """
+        distance = self.data.distance
+        positions = self.positions(trips)
+
+        for t, trip in enumerate(trips):
+            path = [self.depot_id] + trip + [self.depot_id]
+            forward = [0.]
+            backward = [0.]
+
+            for k in range(len(path) - 1):
+                forward.append(forward[-1] + distance(path[k], path[k + 1]))
+                backward.append(backward[-1] + distance(path[k + 1], path[k]))
+
+            for i in range(1, len(path) - 2):
+                previous = path[i - 1]
+
+                for candidate in self.candidates[previous]:
+                    trip_index, j = positions.get(candidate, (None, 0))
+
+                    if trip_index != t or j <= i:
+                        continue
+
+                    delta = distance(previous, path[j]) + distance(path[i], path[j + 1]) \
+                        - distance(previous, path[i]) - distance(path[j], path[j + 1]) \
+                        + (backward[j] - backward[i]) - (forward[j] - forward[i])
+
+                    if delta < -1e-9:
+                        trip[i - 1:j] = reversed(trip[i - 1:j])
+                        return True
+
+        return False
+
+    def move_segment(self, trips: List[List[int]], loads: List[float], length: int) -> bool:
+        """
+            This method applies the first improving relocate (``length`` is one) or or-opt move, i.e., a segment of
+            ``length`` stores is moved after one of the nearest nodes of its first store. If that node is the depot,
+            the segment is moved to the beginning of a trip. A move into another trip fits if the load of that trip
+            and the segment does not exceed ``Data.load_limit``.
+
+            :param trips: Store ids of each trip, which are updated in place
+            :param loads: Load of each trip, which are updated in place
+            :param length: Length of the segment
+            :return: Whether a move has been applied, or not.
+        """
+        distance = self.data.distance
+        capacity = self.data.load_limit
+        positions = self.positions(trips)
+
+        for t, trip in enumerate(trips):
+            path = [self.depot_id] + trip + [self.depot_id]
+
+            for i in range(1, len(path) - length):
+                first, last = path[i], path[i + length - 1]
+                previous, following = path[i - 1], path[i + length]
+                segment_load = sum(self.loads[store] for store in path[i:i + length])
+                removal = distance(previous, first) + distance(last, following) - distance(previous, following)
+
+                for candidate in self.candidates[first]:
+                    if candidate == self.depot_id:
+                        targets = [(target, 0) for target in range(len(trips))]
+                    elif candidate in positions:
+                        targets = [positions[candidate]]
+                    else:
+                        continue
+
+                    for target, x in targets:
+                        if target == t and (i - 1 <= x <= i + length - 1):
+                            continue  # The segment itself, or its current position
+
+                        if target != t and loads[target] + segment_load > capacity:
+                            continue
+
+                        target_path = path if target == t else [self.depot_id] + trips[target] + [self.depot_id]
+                        before, after = target_path[x], target_path[x + 1]
+                        delta = distance(before, first) + distance(last, after) - distance(before, after) - removal
+
+                        if delta < -1e-9:
+                            self.apply_move(trips, loads, t, i, length, target, x, segment_load)
+                            return True
+
+        return False
+
+    def apply_move(self, trips: List[List[int]], loads: List[float], source: int, i: int, length: int, target: int,
+                   x: int, segment_load: float):
+        # Moving trips[source][i - 1:i - 1 + length] after the path index x of the target trip, with its load
+        segment = trips[source][i - 1:i - 1 + length]
+        anchor = trips[target][x - 1] if x > 0 else None
+
+        del trips[source][i - 1:i - 1 + length]
+
+        position = trips[target].index(anchor) + 1 if anchor is not None else 0
+        trips[target][position:position] = segment
+        loads[source] -= segment_load
+        loads[target] += segment_load
+
+        if not trips[source]:
+            del trips[source]
+            del loads[source]
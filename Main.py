@@ -2,13 +2,17 @@ import time
 from Data import Data
 from AStar_iterative import AStar_itearative
 from AStar import AStar
+from IDAStar import IDAStar
 
 from UCS_iterative import UCS_iterative
 from UCS import UCS
 
 from DFS import DFS
 from GreedyDFS import GreedyDFS
+from BeamSearch import BeamSearch
+from ClarkeWright import ClarkeWright
 from RandomSolver import RandomSolver
+from HeldKarp import HeldKarp
 
 
 if __name__ == "__main__":
@@ -18,6 +22,20 @@ if __name__ == "__main__":
     # Load data-
     data = Data(FILE_PATH)
         
+    # Held-Karp
+    print("Held-Karp")
+    held_karp = HeldKarp(data)
+    start_time = time.time()
+    solution_held_karp = held_karp.solve()
+    end_time = time.time()
+    print("Feasibility:", data.is_feasible(solution_held_karp))
+    print("Objective Value:", data.calculate_objective(solution_held_karp))
+    print("Elapsed Time (sec):", end_time - start_time)
+    print("the route: ", end=" ")
+    for node in solution_held_karp:
+      print(node.id, end=",")
+    print("\n")
+
     # A*
     print("A* Iterative")
     a_star_it = AStar_itearative(data)
@@ -46,6 +64,20 @@ if __name__ == "__main__":
       print(node.id, end=",")
     print("\n")
     
+    # IDA*
+    print("IDA*")
+    ida_star = IDAStar(data)
+    start_time = time.time()
+    solution_ida_star = ida_star.solve()
+    end_time = time.time()
+    print("Feasibility:", data.is_feasible(solution_ida_star))
+    print("Objective Value:", data.calculate_objective(solution_ida_star))
+    print("Elapsed Time (sec):", end_time - start_time)
+    print("the route: ", end=" ")
+    for node in solution_ida_star:
+      print(node.id, end=",")
+    print("\n")
+    
     #GreedyDFS -suboptimal
     print("Greedy DFS")
     dfs = GreedyDFS(data)
@@ -60,6 +92,34 @@ if __name__ == "__main__":
       print(node.id, end=",")
     print("\n")
 
+    #Clarke-Wright savings -suboptimal
+    print("Clarke-Wright")
+    clarke_wright = ClarkeWright(data)
+    start_time = time.time()
+    solution_savings = clarke_wright.solve()
+    end_time = time.time()
+    print("Feasibility:", data.is_feasible(solution_savings))
+    print("Objective Value:", data.calculate_objective(solution_savings))
+    print("Elapsed Time (sec):", end_time - start_time)
+    print("the route: ", end=" ")
+    for node in solution_savings:
+      print(node.id, end=",")
+    print("\n")
+
+    #Beam Search -suboptimal
+    print("Beam Search")
+    beam_search = BeamSearch(data)
+    start_time = time.time()
+    solution_beam = beam_search.solve()
+    end_time = time.time()
+    print("Feasibility:", data.is_feasible(solution_beam))
+    print("Objective Value:", data.calculate_objective(solution_beam))
+    print("Elapsed Time (sec):", end_time - start_time)
+    print("the route: ", end=" ")
+    for node in solution_beam:
+      print(node.id, end=",")
+    print("\n")
+
     #DFS
     print("DFS")
     dfs = DFS(data)
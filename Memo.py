@@ -0,0 +1,263 @@
+import heapq
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+ENTRY_SIZE = 256  #: Estimated bytes of an entry, i.e., the table slot, the key tuple, the mask, the loads and the costs
+
+POLICIES = ("lru", "lowest_cost")
+"""
+    Eviction policies: ``"lru"`` evicts the least recently used entry, ``"lowest_cost"`` keeps the entries having the
+    lowest costs (i.e., evicts the highest cost).
+"""
+
+
+class Memo:
+    """
+        This class is the memo table of the tree-search solvers. It maps a compact key, i.e., the bitmask of the visited
+        nodes, the current node and the quantized load, to the lowest cost reaching that key. A state is pruned when
+        the same key has already been reached with a lower or equal cost.
+
+        With ``dominance`` (by default), the load is moved from the key to the value: each (visited set, current node)
+        pair keeps the Pareto front of its (load, cost) pairs, and a state is pruned when another state of the same pair
+        has both lower or equal load and lower or equal cost. Such a state can complete every route of the pruned one
+        at a lower or equal cost, since it has at least the same remaining capacity. Therefore, the states having the
+        same visited set but different loads (e.g., after a depot return) also prune each other.
+
+        If ``max_memory`` is set, the table holds at most ``max_memory / ENTRY_SIZE`` entries, and evicts entries by
+        the given policy when it is full. An entry is a key with its whole front. Evicting an entry only loses pruning,
+        so the solvers stay exact.
+
+        The loads are quantized by ``load_resolution``, so that the keys are pairs of integers. The resolution should
+        be finer than the differences between the loads of the problem, which only merges the floating point noise.
+
+        With ``track_changes``, the keys recorded by ``prune`` are kept until ``changes`` provides their entries, so
+        that the tables of several searches (e.g., the worker processes of ``DFS``) can be combined by ``merge``.
+    """
+    max_memory: Optional[int]   #: Maximum memory of the table in bytes, ``None`` for no limit
+    max_entries: Optional[int]  #: Maximum number of entries, ``None`` for no limit
+    policy: str                 #: Eviction policy (see ``POLICIES``)
+    dominance: bool             #: Whether the states are pruned by dominance across the loads, or not
+    lookups: int                #: Number of lookups
+    hits: int                   #: Number of lookups finding the key
+    evictions: int              #: Number of evicted entries
+
+    def __init__(self, max_memory: Optional[int] = None, policy: str = "lru", load_resolution: float = 1e-6,
+                 dominance: bool = True, track_changes: bool = False):
+        """
+            Constructor
+
+            :param max_memory: Maximum memory of the table in bytes, no limit by default
+            :param policy: Eviction policy (see ``POLICIES``)
+            :param load_resolution: Resolution of the quantized loads
+            :param dominance: Whether the states are pruned by dominance across the loads, or not
+            :param track_changes: Whether the recorded keys are kept for ``changes``, or not
+        """
+        assert policy in POLICIES, f"Unknown memo policy: {policy}"
+
+        self.max_memory = max_memory
+        self.max_entries = max(1, max_memory // ENTRY_SIZE) if max_memory is not None else None
+        self.policy = policy
+        self.dominance = dominance
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        self.__scale = 1. / load_resolution
+        self.__lru = max_memory is not None and policy == "lru"
+        self.__table: Dict[Hashable, float] = OrderedDict() if self.__lru else {}
+        self.__costs = []  # Max-heap of the (negative) costs for the "lowest_cost" policy, with stale entries
+        self.__changes = set() if track_changes else None
+
+    def key(self, mask: int, node_id: int, load: float) -> Tuple[int, ...]:
+        """
+            This method provides the compact key of a state.
+
+            :param mask: Bitmask of the visited nodes
+            :param node_id: Id of the current node
+            :param load: Load of the vehicle, which is not a part of the key with ``dominance``
+            :return: Key as a tuple of integers
+        """
+        if self.dominance:
+            return mask, node_id
+
+        return mask, node_id, round(load * self.__scale)
+
+    def prune(self, key: Hashable, cost: float, load: float = 0.) -> bool:
+        """
+            This method checks whether a state is pruned, i.e., its key has already been reached with a lower or equal
+            cost (and a lower or equal load with ``dominance``). Otherwise, the state is recorded.
+
+            :param key: Key of the state (see ``key``)
+            :param cost: Cost of the state
+            :param load: Load of the vehicle
+            :return: Whether the state is pruned, or not.
+        """
+        self.lookups += 1
+        previous = self.__table.get(key)
+
+        if self.dominance:
+            load = round(load * self.__scale)
+
+        if previous is not None:
+            self.hits += 1
+
+            if self.dominance:
+                pruned = any(other_load <= load and other_cost <= cost for other_load, other_cost in previous)
+            else:
+                pruned = previous <= cost
+
+            if pruned:
+                if self.__lru:
+                    self.__table.move_to_end(key)
+
+                return True
+
+        if self.dominance:
+            # The recorded states dominated by the new one are removed from the front
+            front = [(other_load, other_cost) for other_load, other_cost in previous
+                     if other_load < load or other_cost < cost] if previous is not None else []
+            front.append((load, cost))
+            self.__store(key, front)
+        else:
+            self.__store(key, cost)
+
+        if self.__changes is not None:
+            self.__changes.add(key)
+
+        return False
+
+    def changes(self) -> Dict[Hashable, object]:
+        """
+            This method provides the entries recorded by ``prune`` since the previous call, if ``track_changes`` is
+            set. The evicted entries are left out.
+
+            :return: Entries by their keys
+        """
+        if self.__changes is None:
+            return {}
+
+        entries = {key: self.__table[key] for key in self.__changes if key in self.__table}
+        self.__changes.clear()
+
+        return entries
+
+    def merge(self, entries: Dict[Hashable, object]):
+        """
+            This method adds the entries of another table (see ``changes``), whose states have been searched
+            completely. The fronts are combined with ``dominance``, the lowest costs are kept otherwise. The merged
+            entries are neither counted as lookups, nor provided by ``changes``.
+
+            :param entries: Entries by their keys
+        """
+        for key, value in entries.items():
+            previous = self.__table.get(key)
+
+            if previous is None:
+                self.__store(key, list(value) if self.dominance else value)
+            elif not self.dominance:
+                if value < previous:
+                    self.__store(key, value)
+            else:
+                front = list(previous)
+
+                for load, cost in value:
+                    if not any(other_load <= load and other_cost <= cost for other_load, other_cost in front):
+                        front = [(other_load, other_cost) for other_load, other_cost in front
+                                 if other_load < load or other_cost < cost]
+                        front.append((load, cost))
+
+                if front != previous:
+                    self.__store(key, front)
+
+    def __store(self, key: Hashable, value):
+        """
+            This method stores an entry, and evicts another one by the policy if the table is full.
+
+            :param key: Key of the entry
+            :param value: Front of the (load, cost) pairs with ``dominance``, the lowest cost otherwise
+        """
+        self.__table[key] = value
+
+        if self.max_entries is None:
+            return
+
+        if self.__lru:
+            self.__table.move_to_end(key)
+        else:
+            heapq.heappush(self.__costs, (-self.__cost(value), key))
+
+        if len(self.__table) > self.max_entries:
+            self.evict()
+
+    def evict(self):
+        """
+            This method evicts an entry by the policy.
+        """
+        self.evictions += 1
+
+        if self.__lru:
+            self.__table.popitem(last=False)
+            return
+
+        while True:
+            negative_cost, key = heapq.heappop(self.__costs)
+
+            # Stale heap entries, whose keys have been evicted or reached with a lower cost, are skipped
+            if key in self.__table and self.__cost(self.__table[key]) == -negative_cost:
+                del self.__table[key]
+                break
+
+        if len(self.__costs) > 2 * len(self.__table):
+            self.__costs = [(-self.__cost(value), key) for key, value in self.__table.items()]
+            heapq.heapify(self.__costs)
+
+    def __cost(self, value) -> float:
+        """
+            This method provides the cost of an entry for the ``"lowest_cost"`` policy, i.e., the lowest cost of its
+            front with ``dominance``.
+
+            :param value: Value of the entry
+            :return: Cost of the entry
+        """
+        return min(cost for _, cost in value) if self.dominance else value
+
+    @property
+    def hit_rate(self) -> float:
+        """
+            This method provides the ratio of the lookups finding the key.
+
+            :return: Hit rate
+        """
+        return self.hits / self.lookups if self.lookups else 0.
+
+    def as_dict(self) -> Dict:
+        """
+            This method provides the statistics of the table as a dictionary, e.g., for JSON export.
+
+            :return: Statistics
+        """
+        return {
+            "Policy": self.policy,
+            "Dominance": self.dominance,
+            "MaxMemory": self.max_memory,
+            "Entries": len(self),
+            "Lookups": self.lookups,
+            "HitRate": self.hit_rate,
+            "Evictions": self.evictions,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+            This method checks if the key is in the table, without changing its recency.
+
+            :param key: Key of the state
+            :return: Whether the key is in the table, or not.
+        """
+        return key in self.__table
+
+    def __len__(self) -> int:
+        """
+            This method provides the number of entries.
+
+            :return: Number of entries
+        """
+        return len(self.__table)
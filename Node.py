@@ -1,12 +1,14 @@
 from __future__ import annotations
-from typing import Union
+from typing import Dict, Union
 
 
 class Node:
     """
-        This class represents a **Node**
+        This class represents a **Node**. Its attributes are kept in slots, i.e., without a per-instance dictionary.
     """
 
+    __slots__ = ("__node_id", "__is_depot", "__load")
+
     __node_id: int     #: Each node has a unique id
     __is_depot: bool   #: Whether this node is a depot, or a store
     __load: float      #: Load amount of a store node
@@ -79,3 +81,22 @@ class Node:
             :return: Hash value of the node
         """
         return self.__node_id
+
+    def __getstate__(self) -> Dict[str, Union[int, bool, float]]:
+        """
+            Pickling with the attribute dictionary of the former (i.e., without slots) nodes, so that the pickle files
+            stay readable by both versions.
+
+            :return: State of the node
+        """
+        return {"_Node__node_id": self.__node_id, "_Node__is_depot": self.__is_depot, "_Node__load": self.__load}
+
+    def __setstate__(self, state: Dict[str, Union[int, bool, float]]):
+        """
+            Unpickling the nodes pickled with or without slots (see ``__getstate__``)
+
+            :param state: State of the node
+        """
+        self.__node_id = state["_Node__node_id"]
+        self.__is_depot = state["_Node__is_depot"]
+        self.__load = state["_Node__load"]
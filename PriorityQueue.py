@@ -1,17 +1,35 @@
+import heapq
+from typing import Any, Dict, Hashable, Optional
+
+_REMOVED = object()  #: Placeholder marking a lazily deleted entry
+
 
 class PriorityQueue:
     """
         This class is an implementation of PriorityQueue data structor.
+
+        The queue is backed by a binary heap, so that ``enqueue`` and ``dequeue`` operations run in *O(log n)*. Objects
+        having the same value are dequeued in the insertion order (i.e., FIFO tie-breaking).
+
+        An object can optionally be enqueued with a hashable *key*. Keyed entries can be re-prioritized
+        (``decrease_key``) or removed (``remove``) later. Both operations are implemented with *lazy deletion*: the
+        stale heap entry is only marked as removed and skipped when it reaches the top of the heap.
     """
-    queue: list  #: List of objects
+    queue: list                     #: Binary heap of ``[value, order, key, object]`` entries
+    entries: Dict[Hashable, list]   #: Live heap entries by their keys
+    __order: int                    #: Insertion counter for the stable tie-breaking
+    __size: int                     #: Number of live (i.e., not removed) entries
 
     def __init__(self):
         """
             Constructor
         """
         self.queue = []
+        self.entries = {}
+        self.__order = 0
+        self.__size = 0
 
-    def enqueue(self, obj: object, val: float):
+    def enqueue(self, obj: object, val: float, key: Optional[Hashable] = None):
         """
             Enqueue operation appends the object into the queue based on the given value.
 
@@ -19,12 +37,63 @@ class PriorityQueue:
 
             :param obj: Object that will be added
             :param val: Value of the object. **Note**: A lower value has more priority.
+            :param key: Optional key of the object. If an object with the same key is already in the queue, it is
+                        replaced by the new one.
+        """
+        if key is not None:
+            self.remove(key)
+
+        entry = [val, self.__order, key, obj]
+        self.__order += 1
+        self.__size += 1
+
+        if key is not None:
+            self.entries[key] = entry
+
+        heapq.heappush(self.queue, entry)
+
+    def decrease_key(self, key: Hashable, val: float, obj: Any = _REMOVED) -> bool:
+        """
+            Decrease-key operation updates the value of the object with the given key, if the new value is lower. If
+            there is no such object, it is enqueued only when ``obj`` is provided.
+
+            :param key: Key of the object
+            :param val: New value of the object
+            :param obj: Optional new object to replace the current one.
+            :return: Whether the queue has been updated, or not.
+        """
+        entry = self.entries.get(key)
+
+        if entry is None:
+            if obj is _REMOVED:
+                return False
+
+            self.enqueue(obj, val, key)
+            return True
+
+        if entry[0] <= val:
+            return False
+
+        self.enqueue(entry[3] if obj is _REMOVED else obj, val, key)
+
+        return True
+
+    def remove(self, key: Hashable) -> bool:
+        """
+            This method removes the object with the given key from the queue.
+
+            :param key: Key of the object
+            :return: Whether an object has been removed, or not.
         """
-        self.queue.append([obj, val])
+        entry = self.entries.pop(key, None)
 
-        for i in range(len(self.queue) - 2, -1, -1):
-            if self.queue[i][1] > self.queue[i + 1][1]:
-                self.queue[i], self.queue[i + 1] = self.queue[i + 1], self.queue[i]
+        if entry is None:
+            return False
+
+        entry[3] = _REMOVED
+        self.__size -= 1
+
+        return True
 
     def dequeue(self):
         """
@@ -32,8 +101,46 @@ class PriorityQueue:
 
             :return: Next object
         """
+        while self.queue:
+            _, _, key, obj = heapq.heappop(self.queue)
+
+            if obj is _REMOVED:
+                continue
+
+            if key is not None:
+                del self.entries[key]
+
+            self.__size -= 1
+
+            return obj
+
+        raise IndexError("dequeue from an empty priority queue")
+
+    def peek(self):
+        """
+            This method returns the top of queue without removing it.
+
+            :return: Next object
+        """
+        self.__discard_removed()
+
+        if not self.queue:
+            raise IndexError("peek from an empty priority queue")
+
+        return self.queue[0][3]
+
+    def peek_value(self) -> float:
+        """
+            This method returns the value of the top of queue without removing it.
+
+            :return: Lowest value in the queue
+        """
+        self.__discard_removed()
+
+        if not self.queue:
+            raise IndexError("peek from an empty priority queue")
 
-        return self.queue.pop(0)[0]
+        return self.queue[0][0]
 
     def is_empty(self) -> bool:
         """
@@ -44,6 +151,32 @@ class PriorityQueue:
 
         return len(self) == 0
 
+    def __discard_removed(self):
+        """
+            This method pops the lazily deleted entries at the top of the heap.
+        """
+        while self.queue and self.queue[0][3] is _REMOVED:
+            heapq.heappop(self.queue)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+            This method checks if an object with the given key is in the queue.
+
+            :param key: Key of the object
+            :return: Whether the key is in the queue, or not.
+        """
+
+        return key in self.entries
+
+    def __bool__(self) -> bool:
+        """
+            This method checks if this priority queue has any object.
+
+            :return: Whether the priority queue is non-empty, or not.
+        """
+
+        return self.__size > 0
+
     def __len__(self):
         """
             This method provides the length of queue.
@@ -51,4 +184,4 @@ class PriorityQueue:
             :return: Length of queue
         """
 
-        return len(self.queue)
+        return self.__size
@@ -23,6 +23,9 @@ class RandomSolver(Solver):
             :return: A random solution
         """
 
+        if self.stats is not None:
+            self.stats.start()
+
         # Create random object
         rnd = Random(self.seed) if self.seed is not None else Random()
 
@@ -36,24 +39,22 @@ class RandomSolver(Solver):
 
         #print("Lenght of nodes: ", len(self.data.nodes))
 
-        while not self.data.is_feasible(solution):  # Until a feasible solution is found.
+        number_of_stores = len(self.data.nodes) - 1
+
+        # Until all stores are visited, the route is feasible once it returns to the depot (see ``Data.is_feasible``)
+        while len(visited_nodes) < number_of_stores:
             # Define candidate (i.e., unvisited) stores
             candidate_stores = [store_node for store_node in self.data.store_nodes if store_node not in visited_nodes]
             
             #for node in candidate_stores:
              #   print(f"Cand store : {node.id}")
 
-            # If all stores are visited
-            if len(candidate_stores) == 0:
-                solution.append(self.data.depot_node)
-                continue
-
             # Randomly select the next node
             select_store = rnd.choice(candidate_stores)
             #print("Selceted store ", select_store.id)
 
             # Check remaining capacity
-            if select_store.load > self.data.vehicle_capacity - cumulative_load:
+            if cumulative_load + select_store.load > self.data.load_limit:
                 solution.append(self.data.depot_node)
                 #print("out of capacity")
                 cumulative_load = 0
@@ -62,8 +63,14 @@ class RandomSolver(Solver):
             solution.append(select_store)
             visited_nodes.add(select_store)
             cumulative_load += select_store.load
-        
+
+        solution.append(self.data.depot_node)
+
         # for node in solution:
         #     print(f"Solution : {node.id}")
 
+        if self.stats is not None:
+            self.stats.incumbent(self.data.calculate_objective(solution))
+            self.stats.finish()
+
         return solution
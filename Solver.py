@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
+from numbers import Integral
+from typing import Callable, Optional, Sequence, Union
+from Budget import AnytimeResult, Budget, BudgetExhausted
 from Data import Data, Solution
+from Heuristic import make_heuristic
+from State import State
+from Stats import Stats
 
 
 class Solver(ABC):
@@ -7,6 +13,11 @@ class Solver(ABC):
         This *abstract* class solves the assignment problem.
     """
     data: Data  #: Target problem data
+    stats: Optional[Stats] = None  #: Search statistics, ``None`` when disabled
+    budget: Optional[Budget] = None  #: Search budgets, ``None`` when unlimited
+    exact: bool = False  #: Whether a complete search provides an optimal solution
+    validate_every: int = 0  #: Interval of the generated states checked by ``validate_cost``, ``0`` for none
+    generated: int = 0  #: Number of the generated states counted by ``validate_cost``
 
     def __init__(self, data: Data):
         """
@@ -15,6 +26,7 @@ class Solver(ABC):
             :param data: Target problem data
         """
         self.data = data
+        self.__root_bound = None
 
     @abstractmethod
     def solve(self) -> Solution:
@@ -26,6 +38,125 @@ class Solver(ABC):
         """
         ...
 
+    def enable_stats(self, callback: Optional[Callable[[Stats], None]] = None, interval: Optional[int] = None) -> Stats:
+        """
+            This method enables the search statistics. They are disabled by default, so that the solvers do not have
+            any counting overhead.
+
+            :param callback: Optional callback, which is called with the statistics.
+            :param interval: Number of expansions between the callbacks, only when the search finishes by default.
+            :return: Search statistics
+        """
+        self.stats = Stats(callback, interval)
+
+        return self.stats
+
+    def solve_anytime(self, time_limit: Optional[float] = None, max_expansions: Optional[int] = None,
+                      max_memory: Optional[int] = None) -> AnytimeResult:
+        """
+            This method solves the given problem data within the given budgets. When a budget runs out, the search is
+            stopped, and the best solution found so far (i.e., incumbent) is returned with a proven lower bound and the
+            resulting optimality gap.
+
+            The incumbent is read from the ``optimal_sol`` attribute of the solver.
+
+            :param time_limit: Maximum seconds of the search, no limit by default
+            :param max_expansions: Maximum number of expansions, no limit by default
+            :param max_memory: Maximum growth of the resident memory in bytes, no limit by default
+            :return: Anytime result
+        """
+        self.budget = Budget(time_limit, max_expansions, max_memory)
+        reason = None
+
+        try:
+            solution = self.solve()
+        except BudgetExhausted as exhausted:
+            reason = exhausted.reason
+            solution = getattr(self, "optimal_sol", self.empty_solution)
+
+            if self.stats is not None:
+                self.stats.finish()
+        finally:
+            self.budget = None
+
+        if self.data.is_feasible(solution):
+            objective = self.data.calculate_objective(solution)
+        else:
+            solution, objective = self.empty_solution, float("inf")
+
+        lower_bound = objective if reason is None and self.exact else min(self.lower_bound(), objective)
+
+        if objective == lower_bound:
+            gap = 0.
+        else:
+            gap = (objective - lower_bound) / lower_bound if lower_bound > 0 else float("inf")
+
+        return AnytimeResult(solution, objective, lower_bound, gap, reason is None, reason)
+
+    def warm_start(self, solution: Union[Solution, Sequence[int]]) -> bool:
+        """
+            This method sets the given feasible solution as the initial incumbent, e.g., the solution of
+            ``ClarkeWright``, ``GreedyDFS`` or ``RandomSolver``, or a saved route as node ids (such as the ``Route`` of
+            the ``Batch.solve_many`` records). The tree-search solvers prune every state that cannot beat its objective
+            from the first expansion on, and return it if they do not find a better solution.
+
+            The saving depends on how far the solver expands beyond the optimum on its own. It is large for the
+            recursive ``UCS`` and ``AStar`` and for ``AStar_itearative``, and small for ``DFS``, whose nearest-first
+            successors find a good incumbent early. ``UCS_iterative`` and ``IDAStar`` only expand the states cheaper than
+            the optimum (in cost order, or below the thresholds), so their expansions do not change.
+
+            :param solution: Feasible solution, or its node ids (e.g., ``int`` or ``np.int64``)
+            :return: Whether the solution has become the incumbent, i.e., it is better than the current one.
+            :raises ValueError: If a node id is not in the data, or the solution is not feasible
+        """
+        nodes = self.data.nodes
+
+        if any(isinstance(node, Integral) and not 0 <= node < len(nodes) for node in solution):
+            raise ValueError("Warm start solution has an unknown node id")
+
+        solution = [nodes[int(node)] if isinstance(node, Integral) else node for node in solution]
+
+        if not self.data.is_feasible(solution):
+            raise ValueError("Warm start solution is not feasible")
+
+        objective = self.data.calculate_objective(solution)
+
+        if objective >= getattr(self, "optimal_dist", float("inf")):
+            return False
+
+        self.optimal_sol = solution
+        self.optimal_dist = objective
+
+        return True
+
+    def lower_bound(self) -> float:
+        """
+            This method provides a proven lower bound of the optimal objective, which is the admissible estimate of
+            the whole route from the depot by default. Solvers can tighten it by the state of their search.
+
+            :return: Lower bound
+        """
+        # The estimate of the whole route does not change during the search, so it is computed once
+        if self.__root_bound is None:
+            heuristic = make_heuristic("mst+trip_count", self.data, cache_size=None)
+            self.__root_bound = heuristic(self.data.depot_node, self.data.store_mask, 0.)
+
+        return self.__root_bound
+
+    def validate_cost(self, state: State):
+        """
+            This method counts a generated state, and checks the incremental cost (i.e., g(n)) of every
+            ``validate_every``-th one against the objective of its track, as a debug mode of the solvers carrying the
+            cost on their states.
+
+            :param state: Generated state
+        """
+        self.generated += 1
+
+        if self.validate_every and self.generated % self.validate_every == 0:
+            expected = self.data.calculate_objective(state.track)
+            assert abs(state.cost - expected) <= 1e-6 * max(1., expected), "Incremental g(n) does not match the objective"
+
     @property
     def empty_solution(self) -> Solution:
         """
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from typing import List, Optional
+from Node import Node
+
+
+class State:
+    """
+        This class represents a **search state** of the tree-search algorithms.
+
+        Instead of copying the whole track for each successor, a state only keeps the last node, the set of visited
+        nodes as an integer bitmask (i.e., the bit ``node.id`` is set for each visited node), the cumulative load, the
+        cost, the length of the track and a pointer to its parent state. The track can be reconstructed by following the
+        parent pointers.
+    """
+    __slots__ = ("node", "mask", "load", "cost", "depth", "parent")
+
+    node: Node                  #: Last node of the track
+    mask: int                   #: Bitmask of the visited nodes
+    load: float                 #: Cumulative load since the last depot visit
+    cost: float                 #: Cost of the state (e.g., travelled distance)
+    depth: int                  #: Number of nodes in the track
+    parent: Optional[State]     #: Parent state, ``None`` for the root state
+
+    def __init__(self, node: Node, mask: int, load: float = 0., cost: float = 0., parent: Optional[State] = None):
+        """
+            Constructor
+
+            :param node: Last node of the track
+            :param mask: Bitmask of the visited nodes
+            :param load: Cumulative load since the last depot visit
+            :param cost: Cost of the state
+            :param parent: Parent state
+        """
+        self.node = node
+        self.mask = mask
+        self.load = load
+        self.cost = cost
+        self.depth = parent.depth + 1 if parent is not None else 1
+        self.parent = parent
+
+    @staticmethod
+    def root(node: Node) -> State:
+        """
+            This method creates the initial state, which only visits the given node.
+
+            :param node: Initial node (i.e., depot)
+            :return: Root state
+        """
+        return State(node, 1 << node.id)
+
+    def child(self, node: Node, load: float, cost: float) -> State:
+        """
+            This method creates the successor state which visits the given node after this state.
+
+            :param node: Next node
+            :param load: Cumulative load of the successor state
+            :param cost: Cost of the successor state
+            :return: Successor state
+        """
+        return State(node, self.mask | (1 << node.id), load, cost, self)
+
+    @property
+    def track(self) -> List[Node]:
+        """
+            This method reconstructs the track by following the parent pointers.
+
+            :return: Sequence of visited nodes from the root state
+        """
+        track = []
+        state = self
+
+        while state is not None:
+            track.append(state.node)
+            state = state.parent
+
+        track.reverse()
+
+        return track
+
+    def __contains__(self, node: Node) -> bool:
+        """
+            This method checks if the given node has been visited in the track of this state in constant time.
+
+            :param node: Target node
+            :return: Whether the node is visited, or not.
+        """
+        return (self.mask >> node.id) & 1 == 1
+
+    def __len__(self) -> int:
+        """
+            This method provides the length of the track in constant time.
+
+            :return: Number of nodes in the track
+        """
+        return self.depth
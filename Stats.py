@@ -0,0 +1,181 @@
+import time
+from typing import Callable, Dict, Optional
+
+
+class Stats:
+    """
+        This class holds the search statistics of a solver: the number of expansions and generated states, the maximum
+        frontier size, memo lookups and hits, prunes by their reasons, the time spent in the heuristic, and the time to
+        the first incumbent (i.e., the first complete solution).
+
+        If a callback is given, it is called with this object every ``interval`` expansions (if set) and when the search
+        finishes, e.g., to export the metrics to a monitoring system.
+    """
+    expansions: int                         #: Number of expanded states
+    generated: int                          #: Number of generated (i.e., enqueued or visited) successor states
+    max_frontier: int                       #: Maximum size of the frontier
+    memo_lookups: int                       #: Number of memo lookups
+    memo_hits: int                          #: Number of memo lookups finding the key
+    prunes: Dict[str, int]                  #: Number of prunes by their reasons (bound, capacity, memo)
+    heuristic_time: float                   #: Seconds spent in the heuristic
+    incumbents: int                         #: Number of improving incumbents
+    incumbent_cost: float                   #: Cost of the current incumbent
+    time_to_first_incumbent: Optional[float]    #: Seconds until the first incumbent
+    elapsed: float                          #: Seconds of the search
+    callback: Optional[Callable[["Stats"], None]]   #: Optional callback
+    interval: Optional[int]                 #: Number of expansions between the callbacks
+
+    def __init__(self, callback: Optional[Callable[["Stats"], None]] = None, interval: Optional[int] = None):
+        """
+            Constructor
+
+            :param callback: Optional callback, which is called with this object.
+            :param interval: Number of expansions between the callbacks, only when the search finishes by default.
+        """
+        self.callback = callback
+        self.interval = interval
+        self.start()
+
+    def start(self):
+        """
+            This method resets the statistics at the beginning of the search.
+        """
+        self.expansions = 0
+        self.generated = 0
+        self.max_frontier = 0
+        self.memo_lookups = 0
+        self.memo_hits = 0
+        self.prunes = {"bound": 0, "capacity": 0, "memo": 0}
+        self.heuristic_time = 0.
+        self.incumbents = 0
+        self.incumbent_cost = float("inf")
+        self.time_to_first_incumbent = None
+        self.elapsed = 0.
+        self.__start_time = time.perf_counter()
+
+    def finish(self):
+        """
+            This method records the elapsed time at the end of the search, and calls the callback.
+        """
+        self.elapsed = time.perf_counter() - self.__start_time
+
+        if self.callback is not None:
+            self.callback(self)
+
+    def expand(self, frontier: int = 0):
+        """
+            This method counts an expansion.
+
+            :param frontier: Current size of the frontier
+        """
+        self.expansions += 1
+
+        if frontier > self.max_frontier:
+            self.max_frontier = frontier
+
+        if self.interval and self.callback is not None and self.expansions % self.interval == 0:
+            self.elapsed = time.perf_counter() - self.__start_time
+            self.callback(self)
+
+    def memo(self, hit: bool):
+        """
+            This method counts a memo lookup.
+
+            :param hit: Whether the key is in the memo, or not.
+        """
+        self.memo_lookups += 1
+
+        if hit:
+            self.memo_hits += 1
+
+    def prune(self, reason: str, count: int = 1):
+        """
+            This method counts a prune.
+
+            :param reason: Reason of the prune, i.e., ``"bound"``, ``"capacity"`` or ``"memo"``.
+            :param count: Number of pruned states, e.g., for a batch of successors
+        """
+        self.prunes[reason] = self.prunes.get(reason, 0) + count
+
+    def incumbent(self, cost: float):
+        """
+            This method records an improving incumbent.
+
+            :param cost: Cost of the incumbent
+        """
+        if self.time_to_first_incumbent is None:
+            self.time_to_first_incumbent = time.perf_counter() - self.__start_time
+
+        self.incumbents += 1
+        self.incumbent_cost = cost
+
+    def merge(self, other: "Stats"):
+        """
+            This method adds the counters of another search to this one, e.g., of a work unit solved by a worker
+            process. The incumbents are not merged, since they are recorded by the solver taking them.
+
+            :param other: Statistics of the other search
+        """
+        self.expansions += other.expansions
+        self.generated += other.generated
+        self.max_frontier = max(self.max_frontier, other.max_frontier)
+        self.memo_lookups += other.memo_lookups
+        self.memo_hits += other.memo_hits
+
+        for reason, count in other.prunes.items():
+            self.prune(reason, count)
+
+        self.heuristic_time += other.heuristic_time
+
+    def heuristic(self, heuristic: Callable, *args) -> float:
+        """
+            This method calls the heuristic, and records its elapsed time.
+
+            :param heuristic: Heuristic function
+            :param args: Arguments of the heuristic
+            :return: Heuristic value
+        """
+        start_time = time.perf_counter()
+        value = heuristic(*args)
+        self.heuristic_time += time.perf_counter() - start_time
+
+        return value
+
+    @property
+    def memo_hit_rate(self) -> float:
+        """
+            This method provides the ratio of the memo lookups finding the key.
+
+            :return: Memo hit rate
+        """
+        return self.memo_hits / self.memo_lookups if self.memo_lookups else 0.
+
+    @property
+    def heuristic_share(self) -> float:
+        """
+            This method provides the share of the heuristic in the elapsed time.
+
+            :return: Heuristic time share
+        """
+        return self.heuristic_time / self.elapsed if self.elapsed else 0.
+
+    def as_dict(self) -> Dict:
+        """
+            This method provides the statistics as a dictionary, e.g., for JSON export.
+
+            :return: Statistics
+        """
+        return {
+            "Expansions": self.expansions,
+            "Generated": self.generated,
+            "MaxFrontier": self.max_frontier,
+            "MemoLookups": self.memo_lookups,
+            "MemoHitRate": self.memo_hit_rate,
+            "Prunes": dict(self.prunes),
+            "HeuristicTime": self.heuristic_time,
+            "HeuristicShare": self.heuristic_share,
+            "Incumbents": self.incumbents,
+            "IncumbentCost": self.incumbent_cost,
+            "TimeToFirstIncumbent": self.time_to_first_incumbent,
+            "Elapsed": self.elapsed,
+        }
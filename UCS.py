@@ -1,87 +1,123 @@
-from typing import List
+from typing import Optional, Sequence, Union
 from Data import Data
-from Node import Node
+from Memo import Memo
 from PriorityQueue import PriorityQueue
 from Solver import Solver, Solution
+from State import State
 
 class UCS(Solver):
     """
     This is the recusive UCS CLASS.
 
     This is an recursive approach for Uniform Cost Search algorithm. It is much more faster than iterative approach in UCS_iterative.py.
+
+    The memo table can be bounded by ``memo_memory`` bytes, evicting by ``memo_policy`` (see ``Memo``). An initial
+    incumbent can be given by ``initial_solution`` (see ``Solver.warm_start``).
     """
-    def __init__(self, data: Data):
+    exact = True
+
+    def __init__(self, data: Data, memo_memory: Optional[int] = None, memo_policy: str = "lru",
+                 initial_solution: Optional[Union[Solution, Sequence[int]]] = None):
         super().__init__(data)
+        self.depot = self.data.depot_node
         self.priority_queue = PriorityQueue()
-        self.optimal_sol = [self.data.depot_node]
+        self.optimal_sol = [self.depot]
         self.optimal_dist = float("inf")
         self.min_load = min(node.load for node in self.data.nodes if node.is_store)
         self.max_load = max(node.load for node in self.data.nodes if node.is_store)
+        self.store_mask = self.data.store_mask
+        self.depot_mask = 1 << self.depot.id
         self.iteration = 0
-        self.memo = {}
-    
+        self.memo = Memo(memo_memory, memo_policy)
+
+        if initial_solution is not None:
+            self.warm_start(initial_solution)
+
     def solve(self) -> Solution:
-        self.priority_queue.enqueue([self.data.depot_node],0)
-        visited = set([self.data.depot_node])
-        self.ucs(0,0,visited)
+        if self.stats is not None:
+            self.stats.start()
+
+        root = State.root(self.depot)
+        self.priority_queue.enqueue(root,0)
+        self.ucs(0,0,root.mask)
+
+        if self.stats is not None:
+            self.stats.finish()
         print("Iterations: ", self.iteration)
         return self.optimal_sol
-    
-    def ucs(self, cumulative_load: float, total_dist: float, visited: set):
+
+    def ucs(self, cumulative_load: float, total_dist: float, visited: int):
         if self.priority_queue.is_empty():
             return
-        
-        prior_track = self.priority_queue.dequeue()
-        expanding_node = prior_track[-1]
+
+        stats = self.stats
+        prior_state = self.priority_queue.dequeue()
+        expanding_node = prior_state.node
 
         #Memoization
-        nodes_set = frozenset(node.id for node in prior_track)
-        memo_key =(nodes_set, cumulative_load)
+        memo_key = self.memo.key(prior_state.mask, expanding_node.id, cumulative_load)
+        if stats is not None:
+            stats.memo(memo_key in self.memo)
 
-        if memo_key in self.memo and self.memo[memo_key]<= total_dist:
+        if self.memo.prune(memo_key, total_dist, cumulative_load):
+            if stats is not None:
+                stats.prune("memo")
             return
-        self.memo[memo_key] = total_dist
 
-        min_return_cost = min([self.data.get_distance(expanding_node, self.data.depot_node)] + [self.data.get_distance(expanding_node, n) for n in self.data.nodes if n not in visited])
+        unvisited = self.store_mask & ~prior_state.mask
+        min_return_cost = self.data.cheapest_edge(expanding_node.id, unvisited | self.depot_mask) if unvisited or expanding_node.is_store else 0
 
         if total_dist + min_return_cost  >= self.optimal_dist:
+            if stats is not None:
+                stats.prune("bound")
             return
 
-        if self.is_all_visited(prior_track):
-                prior_track = prior_track + [self.data.depot_node]
-                prior_track_cost = total_dist + self.data.get_distance(expanding_node,self.data.depot_node)
+        if self.is_all_visited(prior_state):
+                prior_track = prior_state.track + [self.depot]
+                prior_track_cost = total_dist + self.data.get_distance(expanding_node,self.depot)
                 if prior_track_cost < self.optimal_dist and self.data.is_feasible(prior_track):
-                    self.optimal_sol = list(prior_track)
+                    self.optimal_sol = prior_track
                     self.optimal_dist = prior_track_cost
+                    if stats is not None:
+                        stats.incumbent(prior_track_cost)
                     return
-                
+
         self.iteration+=1
+        if self.budget is not None:
+            self.budget.check(self.iteration)
+        if stats is not None:
+            stats.expand(len(prior_state))
         for successor in self.data.nodes:
             if successor == expanding_node:
                 continue
-            
-            if successor in visited and successor != self.data.depot_node:
+
+            if (visited >> successor.id) & 1 and successor.is_store:
                 continue
 
             new_obj_func = total_dist + self.data.get_distance(expanding_node,successor)
-            
+
             if new_obj_func >= self.optimal_dist:
+                if stats is not None:
+                    stats.prune("bound")
                 continue
 
-            new_visited = visited.copy()
-            new_visited.add(successor)
-            new_track = prior_track + [successor]
+            new_visited = visited | (1 << successor.id)
             new_load = cumulative_load + successor.load
 
-            if successor.is_store and new_load <= self.data.vehicle_capacity:
-                self.priority_queue.enqueue(new_track, new_obj_func)
+            if stats is not None:
+                if successor.is_store and new_load > self.data.load_limit:
+                    stats.prune("capacity")
+                else:
+                    stats.generated += 1
+
+            if successor.is_store and new_load <= self.data.load_limit:
+                self.priority_queue.enqueue(prior_state.child(successor, new_load, new_obj_func), new_obj_func)
                 self.ucs(cumulative_load + successor.load, new_obj_func, new_visited)
 
             elif successor.is_depot: # and new_load + self.max_load > self.data.vehicle_capacity:
-                self.priority_queue.enqueue(new_track, new_obj_func)
+                self.priority_queue.enqueue(prior_state.child(successor, 0, new_obj_func), new_obj_func)
                 self.ucs(0, new_obj_func, new_visited)
-    
 
-    def is_all_visited (self, track: List[Node]) -> bool:
-        return set(self.data.store_nodes).issubset(set(track))
 
+    def is_all_visited (self, state: State) -> bool:
+        return state.mask & self.store_mask == self.store_mask
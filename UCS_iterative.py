@@ -1,52 +1,81 @@
-from typing import List
+from typing import Optional, Sequence, Union
 from Data import Data
-from Node import Node
+from Memo import Memo
 from PriorityQueue import PriorityQueue
 from Solver import Solver, Solution
+from State import State
 
 class UCS_iterative(Solver):
     """
     This is the Iterative UCS class.
+
+    The memo table can be bounded by ``memo_memory`` bytes, evicting by ``memo_policy`` (see ``Memo``). An initial
+    incumbent can be given by ``initial_solution`` (see ``Solver.warm_start``).
     """
-    def __init__(self, data: Data):
+    exact = True
+
+    def __init__(self, data: Data, memo_memory: Optional[int] = None, memo_policy: str = "lru",
+                 initial_solution: Optional[Union[Solution, Sequence[int]]] = None):
         super().__init__(data)
+        self.depot = self.data.depot_node
         self.priority_queue = PriorityQueue()
-        self.optimal_sol = [self.data.depot_node]
+        self.optimal_sol = [self.depot]
         self.optimal_dist = float("inf")
-        self.visited = set([self.data.depot_node])
         self.max_load = max(node.load for node in self.data.nodes if node.is_store)
+        self.store_mask = self.data.store_mask
+        self.depot_mask = 1 << self.depot.id
         self.iteration = 0
-        self.memo = {}
+        self.memo = Memo(memo_memory, memo_policy)
+
+        if initial_solution is not None:
+            self.warm_start(initial_solution)
+
 
-    
     def solve(self) -> Solution:
-        self.priority_queue.enqueue(([self.data.depot_node],0,0), 0)
+        stats = self.stats
+        if stats is not None:
+            stats.start()
+
+        self.priority_queue.enqueue(State.root(self.depot), 0)
 
         while not self.priority_queue.is_empty():
-            prior_track, prior_track_cost, prior_track_load = self.priority_queue.dequeue()
-            expanding_node = prior_track[-1]
-             
-            # Memoization check 
-            nodes_set = frozenset(node.id for node in prior_track)
-            memo_key =(nodes_set, prior_track_load)
-
-            if memo_key in self.memo and self.memo[memo_key]<= prior_track_cost:
+            if self.budget is not None:
+                self.budget.check(self.iteration)
+
+            prior_state = self.priority_queue.dequeue()
+            prior_track_cost = prior_state.cost
+            expanding_node = prior_state.node
+
+            # Memoization check
+            memo_key = self.memo.key(prior_state.mask, expanding_node.id, prior_state.load)
+            if stats is not None:
+                stats.memo(memo_key in self.memo)
+
+            if self.memo.prune(memo_key, prior_track_cost, prior_state.load):
+                if stats is not None:
+                    stats.prune("memo")
                 continue
-            self.memo[memo_key] = prior_track_cost
-           
-            min_return_cost = min([self.data.get_distance(expanding_node, self.data.depot_node)] + [self.data.get_distance(expanding_node, n) for n in self.data.nodes if n not in self.visited])
+
+            unvisited = self.store_mask & ~prior_state.mask
+            min_return_cost = self.data.cheapest_edge(expanding_node.id, unvisited | self.depot_mask) if unvisited or expanding_node.is_store else 0
             if prior_track_cost+ min_return_cost  >= self.optimal_dist:
+               if stats is not None:
+                   stats.prune("bound")
                continue
 
-            if self.is_all_visited(prior_track):
-                prior_track = prior_track + [self.data.depot_node]
-                prior_track_cost = prior_track_cost + self.data.get_distance(expanding_node,self.data.depot_node)
+            if self.is_all_visited(prior_state):
+                prior_track = prior_state.track + [self.depot]
+                prior_track_cost = prior_track_cost + self.data.get_distance(expanding_node,self.depot)
                 if prior_track_cost < self.optimal_dist and self.data.is_feasible(prior_track):
-                    self.optimal_sol = list(prior_track)
+                    self.optimal_sol = prior_track
                     self.optimal_dist = prior_track_cost
+                    if stats is not None:
+                        stats.incumbent(prior_track_cost)
                     continue
 
             self.iteration+=1
+            if stats is not None:
+                stats.expand(len(self.priority_queue))
             # successors = sorted(
             #    (node for node in self.data.nodes if node not in prior_track or node.is_depot),
             #   key=lambda node: self.data.get_distance(expanding_node, node)
@@ -54,30 +83,40 @@ class UCS_iterative(Solver):
             for successor in self.data.nodes:
                 if successor == expanding_node:
                     continue
-                if successor not in prior_track or successor.is_depot:
+                if successor not in prior_state or successor.is_depot:
                     new_obj_func = prior_track_cost + self.data.get_distance(expanding_node,successor)
-                    
+
                     if new_obj_func >= self.optimal_dist:
+                        if stats is not None:
+                            stats.prune("bound")
                         continue
-                    
-                    new_load = prior_track_load + successor.load
 
-                    if new_load > self.data.vehicle_capacity:
+                    new_load = prior_state.load + successor.load
+
+                    if new_load > self.data.load_limit:
+                        if stats is not None:
+                            stats.prune("capacity")
                         continue
 
-                    if successor.is_store and new_load <= self.data.vehicle_capacity:
-                        new_track = prior_track + [successor]
-                        self.visited.add(expanding_node)
-                        self.priority_queue.enqueue((new_track,new_obj_func,new_load),new_obj_func)
-                            
-                    elif successor.is_depot:# and new_load + self.max_load > self.data.vehicle_capacity: 
-                        new_track = prior_track + [successor]
-                        self.visited.add(expanding_node)
-                        self.priority_queue.enqueue((new_track,new_obj_func,0),new_obj_func)
-         
+                    if stats is not None:
+                        stats.generated += 1
+
+                    if successor.is_store and new_load <= self.data.load_limit:
+                        self.priority_queue.enqueue(prior_state.child(successor, new_load, new_obj_func),new_obj_func)
+
+                    elif successor.is_depot:# and new_load + self.max_load > self.data.vehicle_capacity:
+                        self.priority_queue.enqueue(prior_state.child(successor, 0, new_obj_func),new_obj_func)
+
+        if stats is not None:
+            stats.finish()
         print("Iterations:", self.iteration)
         return self.optimal_sol
-    
-    def is_all_visited (self, track: List[Node]) -> bool:
-        return set(self.data.store_nodes).issubset(set(track))
-    
\ No newline at end of file
+
+    def lower_bound(self) -> float:
+        # Every route not found yet passes through a state in the queue, whose cost is a lower bound of the route
+        frontier = self.priority_queue.peek_value() if self.priority_queue else float("inf")
+
+        return max(super().lower_bound(), min(frontier, self.optimal_dist))
+
+    def is_all_visited (self, state: State) -> bool:
+        return state.mask & self.store_mask == self.store_mask